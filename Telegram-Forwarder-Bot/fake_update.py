@@ -0,0 +1,52 @@
+"""Post a fake Telegram update to the bot webhook of a local web_auth server"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import requests
+
+parser = argparse.ArgumentParser(description="Send a fake Telegram update to /bot/<secret>")
+parser.add_argument("text", help="Message text, e.g. /status")
+parser.add_argument("--url", default="http://localhost:10000", help="web_auth base URL")
+parser.add_argument("--token", default=os.getenv("TG_BOT_TOKEN", ""), help="Bot token the server uses")
+parser.add_argument("--secret", default=os.getenv("BOT_WEBHOOK_SECRET", ""), help="Webhook secret if set on the server")
+parser.add_argument("--username", default=os.getenv("TG_OWNER_USERNAME", "owner"), help="Sender username")
+parser.add_argument("--chat-id", type=int, default=1, help="Sender user/chat ID")
+args = parser.parse_args()
+
+if not args.secret and not args.token:
+    print("Usage: python fake_update.py /status --token <YOUR_BOT_TOKEN>")
+    sys.exit(1)
+# Same default secret as web_auth.webhook_secret
+secret = args.secret or hashlib.sha256(args.token.encode()).hexdigest()[:32]
+
+now = int(time.time())
+user = {"id": args.chat_id, "is_bot": False, "first_name": "Test", "username": args.username.lstrip("@")}
+update = {
+    "update_id": now,
+    "message": {
+        "message_id": now % 100000,
+        "date": now,
+        "from": user,
+        "chat": {"id": args.chat_id, "type": "private", "username": user["username"]},
+        "text": args.text,
+    },
+}
+if args.text.startswith("/"):
+    command = args.text.split()[0]
+    update["message"]["entities"] = [{"type": "bot_command", "offset": 0, "length": len(command)}]
+
+response = requests.post(
+    f"{args.url.rstrip('/')}/bot/{secret}",
+    data=json.dumps(update),
+    headers={"Content-Type": "application/json", "X-Telegram-Bot-Api-Secret-Token": secret},
+    timeout=10,
+)
+if response.ok:
+    print(f"✅ Update accepted ({response.status_code})")
+else:
+    print(f"❌ Server replied {response.status_code}: {response.text}")
+print("   Replies go to the real chat ID, so use your own ID with --chat-id to see them in Telegram")
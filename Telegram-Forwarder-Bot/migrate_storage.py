@@ -0,0 +1,36 @@
+"""Copy config, groups and content from one web_auth storage backend to another"""
+import argparse
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from source.utils.Storage import open_store
+
+load_dotenv()
+
+BACKENDS = ("mongo", "sqlite", "json")
+RESOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources")
+
+parser = argparse.ArgumentParser(description="Copy all web_auth data between storage backends")
+parser.add_argument("source", choices=BACKENDS, help="Backend to read from")
+parser.add_argument("target", choices=BACKENDS, help="Backend to replace with the source's data")
+args = parser.parse_args()
+
+if args.source == args.target:
+    print("Source and target are the same backend")
+    sys.exit(1)
+
+try:
+    os.makedirs(RESOURCE_PATH, exist_ok=True)
+    source = open_store(args.source, RESOURCE_PATH, os.getenv("MONGO_URI"))
+    target = open_store(args.target, RESOURCE_PATH, os.getenv("MONGO_URI"))
+except Exception as e:
+    print(f"❌ Cannot open storage: {e}")
+    sys.exit(1)
+
+data = source.dump()
+target.replace_all(data)
+items = sum(len(content) for content in data["content"].values())
+print(f"✅ Copied config, {len(data['groups'])} groups and {items} content items from {args.source} to {args.target}")
+print(f"   Set STORAGE_BACKEND={args.target} to use it")
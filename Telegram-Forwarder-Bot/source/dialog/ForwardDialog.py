@@ -1,3 +1,7 @@
+from datetime import date
+
+from InquirerPy import inquirer
+
 from source.dialog.BaseDialog import BaseDialog
 from source.model.ForwardConfig import ForwardConfig
 
@@ -11,6 +15,20 @@ class ForwardDialog(BaseDialog):
         self.clear()
         return await self._get_forward_config()
 
+    async def get_history_config(self):
+        """Get forward configuration plus the window of past messages to forward.
+        
+        Returns:
+            Dict mapping source chat IDs to their forward configurations
+        """
+        forward_config_map = await self.get_config()
+        window = await self._get_history_window(list(forward_config_map.values()))
+        if window is not None:
+            for config in forward_config_map.values():
+                config.set_history_window(**window)
+            ForwardConfig.write(list(forward_config_map.values()))
+        return forward_config_map
+
     async def _get_forward_config(self):
         """Get forward configuration settings.
         
@@ -29,4 +47,67 @@ class ForwardDialog(BaseDialog):
         if choice == "2":
             forward_config_list = await ForwardConfig.get_all(False)
         
-        return {item.sourceID: item for item in forward_config_list} 
\ No newline at end of file
+        return {item.sourceID: item for item in forward_config_list}
+
+    async def _get_history_window(self, forward_config_list):
+        """Get which part of the history should be forwarded.
+        
+        Returns:
+            dict: Window keyword arguments for ForwardConfig.set_history_window,
+            or None to keep the saved windows
+        """
+        options = [
+            {"name": "Entire history", "value": "all"},
+            {"name": "Last N messages", "value": "last"},
+            {"name": "Date range", "value": "dates"},
+            {"name": "Message ID range", "value": "ids"}
+        ]
+        if any(config.has_history_window() for config in forward_config_list):
+            options.insert(0, {"name": "Use saved window", "value": "saved"})
+
+        choice = await self.show_options("Messages to forward:", options)
+        if choice == "saved":
+            return None
+        if choice == "last":
+            return {"lastN": await self._prompt_number("Number of newest messages to forward:", "100")}
+        if choice == "dates":
+            from_date = await self._prompt_date("From date (YYYY-MM-DD, empty for no limit):")
+            to_date = await self._prompt_date("To date (YYYY-MM-DD, empty for no limit):", not_before=from_date)
+            return {"fromDate": from_date, "toDate": to_date}
+        if choice == "ids":
+            min_id = await self._prompt_number("From message ID (empty for no limit):", "", optional=True)
+            max_id = await self._prompt_number("To message ID (empty for no limit):", "", optional=True,
+                                               minimum=min_id)
+            return {"minID": min_id, "maxID": max_id}
+        return {}
+
+    async def _prompt_number(self, message, default, optional=False, minimum=None):
+        minimum = minimum or 1
+        value = await inquirer.text(
+            message=message,
+            default=default,
+            validate=lambda x: (optional and not x) or (x.isdigit() and int(x) >= minimum),
+            invalid_message=f"Please enter a number of at least {minimum}"
+        ).execute_async()
+        return int(value) if value else None
+
+    async def _prompt_date(self, message, not_before=None):
+        """Ask for an optional ISO date, not earlier than not_before if given."""
+        value = await inquirer.text(
+            message=message,
+            default="",
+            validate=lambda x: self._is_date(x, not_before),
+            invalid_message=(f"Please enter a date as YYYY-MM-DD, not before {not_before}"
+                             if not_before else "Please enter a date as YYYY-MM-DD")
+        ).execute_async()
+        return value or None
+
+    @staticmethod
+    def _is_date(value, not_before=None):
+        if not value:
+            return True
+        try:
+            parsed = date.fromisoformat(value)
+        except ValueError:
+            return False
+        return not_before is None or parsed >= date.fromisoformat(not_before)
@@ -72,7 +72,7 @@ class MainMenu:
         await self.telegram.start_forward_live(config)
 
     async def past_forward(self):
-        config = await self.forward_dialog.get_config()
+        config = await self.forward_dialog.get_history_config()
         await self.telegram.past_forward(config)
 
     async def delete_messages(self):
@@ -127,9 +127,10 @@ class MainMenu:
                 self.telegram.init_autopost(config)
                 status = self.telegram.get_autopost_status()
                 if status:
-                    self.console.print(f"Total: {status['total']}, Pending: {status['pending']}, Posted: {status['posted']}")
+                    self.console.print(f"Total: {status['total']}, Pending: {status['pending']}, Posted: {status['posted']}, Failed sends: {status['failed_sends']}")
                     self.console.print(f"Next Post Time: {status['next_post_time']}")
                     self.console.print(f"Channel ID: {status['channel_id']}")
+                    self.console.print(f"Target Channels: {', '.join(map(str, status['target_channels']))}")
             elif action == "list_pending":
                 self.telegram.init_autopost(config)
                 pending = self.telegram.list_autopost_pending()
@@ -137,7 +138,12 @@ class MainMenu:
                     self.console.print("[bold yellow]No pending posts.[/bold yellow]")
                 else:
                     for item in pending:
-                        self.console.print(f"{item['scheduled_for']} - {item['photo_path']}")
+                        files = item.get('photo_paths') or item.get('file_ids')
+                        if files:
+                            media = f"album of {len(files)} photos"
+                        else:
+                            media = item.get('photo_path') or f"file_id {item.get('file_id')}"
+                        self.console.print(f"{item['scheduled_for']} - {media}")
             elif action == "clear_posted":
                 self.telegram.clear_autopost_posted()
                 self.console.print("[bold green]Cleared posted items.[/bold green]")
\ No newline at end of file
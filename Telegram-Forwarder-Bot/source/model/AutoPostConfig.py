@@ -1,17 +1,29 @@
 import json
 import os
+from datetime import datetime
 from InquirerPy import inquirer
+from source.model.PostingSchedule import PostingSchedule
 from source.utils.Constants import AUTOPOST_CONFIG_FILE_PATH, AUTOPOST_MEDIA_PATH
 
 
 class AutoPostConfig:
-    def __init__(self, bot_token=None, owner_username=None, channel_id=None, posting_hour=13, posting_minute=0, channels=None):
+    def __init__(self, bot_token=None, owner_username=None, channel_id=None, posting_hour=13, posting_minute=0, channels=None,
+                 preupload_minutes=10, posting_slots=None, posting_weekdays=None, posting_cron=None,
+                 target_channels=None, send_concurrency=5, optimize_images=True, use_file_ids=False):
         self.bot_token = bot_token
         self.owner_username = owner_username
         self.channel_id = channel_id  # Active channel
         self.posting_hour = posting_hour
         self.posting_minute = posting_minute
         self.channels = channels or {}  # Dict of {channel_id: channel_name}
+        self.preupload_minutes = preupload_minutes  # Upload media this long before posting
+        self.posting_slots = posting_slots or [f"{int(posting_hour):02d}:{int(posting_minute):02d}"]  # Daily "HH:MM" slots
+        self.posting_weekdays = posting_weekdays or []  # 0 = Monday, empty for every day
+        self.posting_cron = posting_cron  # Cron expression, overrides slots and weekdays
+        self.target_channels = target_channels or []  # Channels each post goes to, active channel if empty
+        self.send_concurrency = send_concurrency  # Channels posted to at the same time
+        self.optimize_images = optimize_images  # Resize and re-encode photos before posting (needs Pillow)
+        self.use_file_ids = use_file_ids  # Queue bot photos by file_id and post them through the bot
 
     @staticmethod
     def read():
@@ -44,9 +56,17 @@ class AutoPostConfig:
         channel_id = os.getenv("TG_CHANNEL_ID")
         posting_hour = os.getenv("POSTING_TIME_HOUR")
         posting_minute = os.getenv("POSTING_TIME_MINUTE")
+        preupload_minutes = os.getenv("PREUPLOAD_MINUTES")
+        posting_slots = os.getenv("POSTING_SLOTS")
+        posting_weekdays = os.getenv("POSTING_WEEKDAYS")
+        posting_cron = os.getenv("POSTING_CRON")
+        optimize_images = os.getenv("OPTIMIZE_IMAGES", "true").lower() not in ("0", "false", "no")
+        use_file_ids = os.getenv("USE_FILE_IDS", "false").lower() in ("1", "true", "yes")
 
         if not bot_token or not owner_username:
             return None
+        if not AutoPostConfig._valid_cron(posting_cron):
+            raise ValueError(f"POSTING_CRON {posting_cron!r} is not a valid cron expression with upcoming posting times")
 
         ch_id = int(channel_id) if channel_id else None
         channels = {ch_id: "Default Channel"} if ch_id else {}
@@ -57,9 +77,19 @@ class AutoPostConfig:
             channel_id=ch_id,
             posting_hour=int(posting_hour or 13),
             posting_minute=int(posting_minute or 0),
-            channels=channels
+            channels=channels,
+            preupload_minutes=int(preupload_minutes or 10),
+            posting_slots=AutoPostConfig._split(posting_slots),
+            posting_weekdays=[int(day) for day in AutoPostConfig._split(posting_weekdays)],
+            posting_cron=posting_cron or None,
+            optimize_images=optimize_images,
+            use_file_ids=use_file_ids
         )
 
+    @staticmethod
+    def _split(value):
+        return [part.strip() for part in (value or "").split(",") if part.strip()]
+
     @staticmethod
     async def _get_from_user():
         bot_token = await inquirer.text(message="Enter Bot Token (TG_BOT_TOKEN):").execute_async()
@@ -88,6 +118,25 @@ class AutoPostConfig:
             except ValueError:
                 print("Please enter a valid number")
 
+        extra_slots = await inquirer.text(
+            message="Extra daily posting times (HH:MM, comma separated, optional):",
+            default="",
+            validate=AutoPostConfig._valid_slots,
+            invalid_message="Use HH:MM times separated by commas"
+        ).execute_async()
+        posting_weekdays = await inquirer.text(
+            message="Posting weekdays (0=Mon ... 6=Sun, comma separated, empty for every day):",
+            default="",
+            validate=lambda x: all(day.isdigit() and int(day) <= 6 for day in AutoPostConfig._split(x)),
+            invalid_message="Use numbers 0-6 separated by commas"
+        ).execute_async()
+        posting_cron = await inquirer.text(
+            message="Cron expression (optional, overrides the times above):",
+            default="",
+            validate=AutoPostConfig._valid_cron,
+            invalid_message="Use 5 cron fields (minute hour day month weekday) that match an upcoming time"
+        ).execute_async()
+
         channel_id = int(channel_id_str) if channel_id_str else None
         channels = {channel_id: "Default Channel"} if channel_id else {}
 
@@ -97,7 +146,10 @@ class AutoPostConfig:
             channel_id=channel_id,
             posting_hour=int(posting_hour),
             posting_minute=int(posting_minute),
-            channels=channels
+            channels=channels,
+            posting_slots=[f"{hour:02d}:{minute:02d}"] + AutoPostConfig._split(extra_slots),
+            posting_weekdays=[int(day) for day in AutoPostConfig._split(posting_weekdays)],
+            posting_cron=posting_cron.strip() or None
         )
         AutoPostConfig.write(config)
         return config
@@ -107,9 +159,38 @@ class AutoPostConfig:
             "channel_id": self.channel_id,
             "posting_hour": self.posting_hour,
             "posting_minute": self.posting_minute,
+            "preupload_minutes": self.preupload_minutes,
+            "posting_slots": self.posting_slots,
+            "posting_weekdays": self.posting_weekdays,
+            "posting_cron": self.posting_cron,
+            "target_channels": self.target_channels,
+            "send_concurrency": self.send_concurrency,
+            "optimize_images": self.optimize_images,
+            "bot_token": self.bot_token,
             "media_path": AUTOPOST_MEDIA_PATH
         }
 
+    @staticmethod
+    def _valid_slots(value):
+        try:
+            for slot in AutoPostConfig._split(value):
+                hour, minute = slot.split(":")
+                if not (0 <= int(hour) <= 23 and 0 <= int(minute) <= 59):
+                    return False
+            return True
+        except ValueError:
+            return False
+
+    @staticmethod
+    def _valid_cron(value):
+        if not (value or "").strip():
+            return True
+        try:
+            PostingSchedule(cron=value.strip()).next_slot(datetime.now())
+            return True
+        except ValueError:
+            return False
+
     def add_channel(self, channel_id, channel_name):
         """Add a channel to the config."""
         self.channels[channel_id] = channel_name
@@ -125,10 +206,17 @@ class AutoPostConfig:
             return True
         return False
 
+    def set_target_channels(self, channel_ids):
+        """Set the channels each post is sent to, empty for the active channel only."""
+        self.target_channels = [int(ch) for ch in channel_ids]
+        AutoPostConfig.write(self)
+
     def remove_channel(self, channel_id):
         """Remove a channel from config."""
         if channel_id in self.channels:
             del self.channels[channel_id]
+            if channel_id in self.target_channels:
+                self.target_channels.remove(channel_id)
             if self.channel_id == channel_id:
                 self.channel_id = next(iter(self.channels.keys()), None)
             AutoPostConfig.write(self)
@@ -0,0 +1,272 @@
+"""Queue storage for AutoPost posts.
+
+Posts are kept in an SQLite database as JSON documents next to the indexed
+``posted`` and ``scheduled_for`` columns, so finding the next due post is an
+index lookup and single posts are updated in place instead of rewriting the
+whole queue file. The outcome of sending a post to each of its target
+channels is kept in a separate table.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import date, datetime
+from threading import RLock
+from typing import Optional
+
+from source.utils.Constants import AUTOPOST_QUEUE_FILE_PATH, AUTOPOST_SCHEDULE_FILE_PATH
+
+
+class AutoPostQueue:
+    """Indexed store for queued AutoPost posts.
+
+    Attributes:
+        db_path (str): Path of the SQLite database file
+    """
+
+    def __init__(self, db_path: str = AUTOPOST_QUEUE_FILE_PATH, legacy_path: Optional[str] = AUTOPOST_SCHEDULE_FILE_PATH):
+        """Open the queue and migrate the legacy TinyDB queue if present.
+
+        Args:
+            db_path: Path of the SQLite database file
+            legacy_path: Path of the old TinyDB queue to import once
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        # The receiver thread and the scheduler share one connection
+        self._lock = RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        if legacy_path:
+            self._migrate_legacy(legacy_path)
+
+        self._counts = self._load_counts()
+
+    def _create_schema(self):
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    posted INTEGER NOT NULL DEFAULT 0,
+                    scheduled_for TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_posts_due ON posts (posted, scheduled_for, id)"
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS post_results (
+                    post_id INTEGER NOT NULL,
+                    channel_id INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    message_id INTEGER,
+                    error TEXT,
+                    sent_at TEXT NOT NULL,
+                    PRIMARY KEY (post_id, channel_id)
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_post_results_status ON post_results (status)"
+            )
+
+    def _migrate_legacy(self, legacy_path: str):
+        """Import posts from the old TinyDB queue file, then rename it."""
+        if not os.path.exists(legacy_path):
+            return
+        if self._conn.execute("SELECT 1 FROM posts LIMIT 1").fetchone():
+            return
+
+        with open(legacy_path, "r") as file:
+            try:
+                tables = json.load(file)
+            except ValueError:
+                tables = {}
+
+        # TinyDB layout: {"_default": {"1": {...}, "2": {...}}}
+        documents = tables.get("_default", {})
+        posts = [documents[key] for key in sorted(documents, key=int)]
+        with self._lock, self._conn:
+            for post in posts:
+                self._insert(post)
+
+        os.replace(legacy_path, legacy_path + ".migrated")
+        print(f"Migrated {len(posts)} AutoPost queue items from {legacy_path}")
+
+    def _load_counts(self) -> dict:
+        counts = {0: 0, 1: 0}
+        for row in self._conn.execute("SELECT posted, COUNT(*) AS total FROM posts GROUP BY posted"):
+            counts[row["posted"]] = row["total"]
+        return counts
+
+    def _insert(self, post: dict) -> int:
+        post = dict(post)
+        post.pop("id", None)
+        post.setdefault("posted", 0)
+        post.setdefault("scheduled_for", date.today().isoformat())
+        cursor = self._conn.execute(
+            "INSERT INTO posts (posted, scheduled_for, data) VALUES (?, ?, ?)",
+            (int(post["posted"]), post["scheduled_for"], json.dumps(post, default=str))
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def _to_post(row) -> Optional[dict]:
+        if row is None:
+            return None
+        post = json.loads(row["data"])
+        post["id"] = row["id"]
+        post["posted"] = row["posted"]
+        post["scheduled_for"] = row["scheduled_for"]
+        return post
+
+    def insert(self, post: dict) -> dict:
+        """Add a post to the queue.
+
+        Args:
+            post: Post data, must contain ``scheduled_for``
+
+        Returns:
+            dict: The stored post including its ``id``
+        """
+        with self._lock, self._conn:
+            post_id = self._insert(post)
+            self._counts[int(post.get("posted", 0))] += 1
+        return {**post, "id": post_id}
+
+    def update(self, post_id: int, fields: dict):
+        """Merge fields into a single post.
+
+        Args:
+            post_id: ID of the post
+            fields: Fields to set
+        """
+        with self._lock, self._conn:
+            post = self._to_post(self._conn.execute("SELECT * FROM posts WHERE id = ?", (post_id,)).fetchone())
+            if post is None:
+                return
+            was_posted = post["posted"]
+            post.update(fields)
+            post.pop("id")
+            self._conn.execute(
+                "UPDATE posts SET posted = ?, scheduled_for = ?, data = ? WHERE id = ?",
+                (int(post["posted"]), post["scheduled_for"], json.dumps(post, default=str), post_id)
+            )
+            if int(post["posted"]) != was_posted:
+                self._counts[was_posted] -= 1
+                self._counts[int(post["posted"])] += 1
+
+    def mark_posted(self, post_id: int):
+        """Mark a post as posted."""
+        self.update(post_id, {"posted": 1})
+
+    def get(self, post_id: int) -> Optional[dict]:
+        with self._lock:
+            return self._to_post(self._conn.execute("SELECT * FROM posts WHERE id = ?", (post_id,)).fetchone())
+
+    def next_due(self, until: str) -> Optional[dict]:
+        """Get the oldest unposted post scheduled at or before ``until``.
+
+        Args:
+            until: ISO date or datetime upper bound
+
+        Returns:
+            dict: The post, or None if nothing is due
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM posts WHERE posted = 0 AND scheduled_for <= ? "
+                "ORDER BY scheduled_for, id LIMIT 1",
+                (until,)
+            ).fetchone()
+        return self._to_post(row)
+
+    def first_pending(self) -> Optional[dict]:
+        """Get the earliest scheduled unposted post regardless of its date."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM posts WHERE posted = 0 ORDER BY scheduled_for, id LIMIT 1"
+            ).fetchone()
+        return self._to_post(row)
+
+    def last_scheduled(self) -> Optional[str]:
+        """Get the latest scheduled_for among unposted posts."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT scheduled_for FROM posts WHERE posted = 0 ORDER BY scheduled_for DESC LIMIT 1"
+            ).fetchone()
+        return row["scheduled_for"] if row else None
+
+    def pending(self) -> list:
+        """Get all unposted posts in scheduled order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM posts WHERE posted = 0 ORDER BY scheduled_for, id"
+            ).fetchall()
+        return [self._to_post(row) for row in rows]
+
+    def record_result(self, post_id: int, channel_id: int, status: str,
+                      message_id: Optional[int] = None, error: Optional[str] = None):
+        """Store the outcome of sending a post to one channel.
+
+        Args:
+            post_id: ID of the post
+            channel_id: Target channel ID
+            status: "sent" or "failed"
+            message_id: ID of the sent message
+            error: Error text for failed sends
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO post_results (post_id, channel_id, status, message_id, error, sent_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (post_id, channel_id, status, message_id, error, datetime.now().isoformat())
+            )
+
+    def get_results(self, post_id: int) -> list:
+        """Get the per-channel outcomes of a post."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM post_results WHERE post_id = ? ORDER BY channel_id", (post_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_failed(self) -> int:
+        """Count failed channel sends of posts still in the queue."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS total FROM post_results WHERE status = 'failed'"
+            ).fetchone()
+        return row["total"]
+
+    def clear_posted(self) -> int:
+        """Delete all posted items and their channel outcomes.
+
+        Returns:
+            int: Number of removed posts
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM post_results WHERE post_id IN (SELECT id FROM posts WHERE posted = 1)"
+            )
+            removed = self._conn.execute("DELETE FROM posts WHERE posted = 1").rowcount
+            self._counts[1] = 0
+        return removed
+
+    def count_pending(self) -> int:
+        return self._counts[0]
+
+    def count_posted(self) -> int:
+        return self._counts[1]
+
+    def count(self) -> int:
+        return self._counts[0] + self._counts[1]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,5 +1,6 @@
 import json
 import os.path
+from datetime import datetime, timedelta
 
 from source.model.Chat import Chat
 from source.utils.Constants import FORWARD_CONFIG_FILE_PATH
@@ -8,11 +9,18 @@ from source.dialog.BaseDialog import BaseDialog
 
 class ForwardConfig:
 
-    def __init__(self, sourceID=None, sourceName=None, destinationID=None, destinationName=None):
+    def __init__(self, sourceID=None, sourceName=None, destinationID=None, destinationName=None,
+                 fromDate=None, toDate=None, minID=None, maxID=None, lastN=None):
         self.sourceID = sourceID
         self.sourceName = sourceName
         self.destinationID = destinationID
         self.destinationName = destinationName
+        # Past forward window (all optional, None means unbounded)
+        self.fromDate = fromDate  # ISO date, inclusive
+        self.toDate = toDate      # ISO date, inclusive
+        self.minID = minID        # Message ID, inclusive
+        self.maxID = maxID        # Message ID, inclusive
+        self.lastN = lastN        # Only the newest N messages
 
     @staticmethod
     def write(forward_config_list):
@@ -60,5 +68,56 @@ class ForwardConfig:
         else:
             return await ForwardConfig.scan()
 
+    def set_history_window(self, fromDate=None, toDate=None, minID=None, maxID=None, lastN=None):
+        """Set the window used when forwarding past messages."""
+        self.fromDate = fromDate
+        self.toDate = toDate
+        self.minID = minID
+        self.maxID = maxID
+        self.lastN = lastN
+
+    def has_history_window(self):
+        return any(value is not None for value in
+                   (self.fromDate, self.toDate, self.minID, self.maxID, self.lastN))
+
+    def get_history_window(self):
+        """Get the past forward window as parsed values.
+
+        Dates are interpreted in the local timezone and ``toDate`` covers the
+        whole day, so the returned ``to_date`` is the exclusive start of the next day.
+
+        Returns:
+            dict: from_date, to_date (aware datetimes), min_id, max_id, last_n
+        """
+        return {
+            "from_date": self._parse_date(self.fromDate),
+            "to_date": self._parse_date(self.toDate, next_day=True),
+            "min_id": int(self.minID) if self.minID is not None else None,
+            "max_id": int(self.maxID) if self.maxID is not None else None,
+            "last_n": int(self.lastN) if self.lastN is not None else None,
+        }
+
+    @staticmethod
+    def _parse_date(value, next_day=False):
+        if not value:
+            return None
+        parsed = datetime.fromisoformat(value)
+        if next_day and len(value) <= 10:
+            parsed += timedelta(days=1)
+        return parsed.astimezone()
+
+    def _window_repr(self):
+        parts = []
+        if self.lastN is not None:
+            parts.append(f"last {self.lastN}")
+        if self.fromDate or self.toDate:
+            parts.append(f"dates {self.fromDate or '...'} → {self.toDate or '...'}")
+        if self.minID is not None or self.maxID is not None:
+            parts.append(f"ids {self.minID or '...'} → {self.maxID or '...'}")
+        return ", ".join(parts)
+
     def __repr__(self):
-        return f'sourceName= "{self.sourceName}", destinationName= "{self.destinationName}"'
+        text = f'sourceName= "{self.sourceName}", destinationName= "{self.destinationName}"'
+        if self.has_history_window():
+            text += f', window= "{self._window_repr()}"'
+        return text
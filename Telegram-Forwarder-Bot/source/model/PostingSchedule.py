@@ -0,0 +1,163 @@
+"""Posting schedules for AutoPost.
+
+A schedule is either a set of daily slots (optionally limited to some
+weekdays) or a cron expression. Posting times are precomputed into a sorted
+timeline so the next free slot is found by bisection.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, time, timedelta
+from typing import Iterable, Optional
+
+
+class CronExpression:
+    """Minimal five field cron expression (minute hour day-of-month month day-of-week).
+
+    Supports ``*``, lists, ranges and steps. Day of week uses cron numbering
+    (0 or 7 = Sunday).
+    """
+
+    _RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields, got {len(fields)}: {expression!r}")
+        self.expression = expression
+        parsed = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self._RANGES)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # 7 is the cron alias of Sunday
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> set:
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(value) for value in part.split("-", 1))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Invalid cron field {field!r}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def matches_day(self, day) -> bool:
+        if day.month not in self.months:
+            return False
+        day_match = day.day in self.days
+        weekday_match = (day.weekday() + 1) % 7 in self.weekdays
+        # Standard cron: when both are restricted either one may match
+        if self._any_day:
+            return weekday_match
+        if self._any_weekday:
+            return day_match
+        return day_match or weekday_match
+
+    def times(self) -> list:
+        return [time(hour, minute) for hour in sorted(self.hours) for minute in sorted(self.minutes)]
+
+    def __str__(self):
+        return self.expression
+
+
+class PostingSchedule:
+    """Posting times from daily slots, a weekday mask or a cron expression.
+
+    Attributes:
+        slots (list[time]): Daily posting times, ignored when cron is set
+        weekdays (set[int]): Allowed weekdays for slots, 0 = Monday
+        cron (CronExpression): Optional cron expression
+    """
+
+    HORIZON_DAYS = 31
+
+    def __init__(self, slots: Optional[Iterable] = None, weekdays: Optional[Iterable[int]] = None,
+                 cron: Optional[str] = None):
+        """Initialize the schedule.
+
+        Args:
+            slots: Daily times as ``time`` objects or "HH:MM" strings
+            weekdays: Allowed weekdays (0 = Monday), all days if empty
+            cron: Cron expression, overrides slots and weekdays
+        """
+        self.slots = sorted({self._parse_time(slot) for slot in (slots or [])}) or [time(13, 0)]
+        self.weekdays = set(int(day) for day in weekdays) if weekdays else set(range(7))
+        if not self.weekdays <= set(range(7)):
+            raise ValueError(f"Weekdays must be 0 (Monday) to 6 (Sunday), got {sorted(self.weekdays)}")
+        self.cron = CronExpression(cron) if cron else None
+        self._daily_times = self.cron.times() if self.cron else self.slots
+
+        # Sorted posting times covering [_start, _end)
+        self._timeline = []
+        self._start = None
+        self._end = None
+
+    @staticmethod
+    def _parse_time(value) -> time:
+        if isinstance(value, time):
+            return value
+        hour, minute = str(value).strip().split(":")
+        return time(int(hour), int(minute))
+
+    def _is_posting_day(self, day) -> bool:
+        if self.cron:
+            return self.cron.matches_day(day)
+        return day.weekday() in self.weekdays
+
+    def _day_times(self, day) -> list:
+        if not self._is_posting_day(day):
+            return []
+        return [datetime.combine(day, slot) for slot in self._daily_times]
+
+    def _cover(self, moment: datetime):
+        """Extend the precomputed timeline so it covers moment."""
+        day = moment.date()
+        if self._start is None or day < self._start:
+            self._start = day
+            self._end = day
+            self._timeline = []
+        while self._end <= day:
+            self._extend()
+
+    def _extend(self):
+        for offset in range(self.HORIZON_DAYS):
+            self._timeline.extend(self._day_times(self._end + timedelta(days=offset)))
+        self._end += timedelta(days=self.HORIZON_DAYS)
+
+    def next_slot(self, after: datetime, inclusive: bool = False) -> datetime:
+        """Get the first posting time after a moment.
+
+        Args:
+            after: Reference moment
+            inclusive: Also accept a slot exactly at ``after``
+
+        Returns:
+            datetime: The next posting time
+        """
+        self._cover(after)
+        search = bisect_left if inclusive else bisect_right
+        for _ in range(366 // self.HORIZON_DAYS + 2):
+            index = search(self._timeline, after)
+            if index < len(self._timeline):
+                return self._timeline[index]
+            self._extend()
+        raise ValueError(f"Schedule {self} has no posting times within a year")
+
+    def __str__(self):
+        if self.cron:
+            return f"cron '{self.cron}'"
+        slots = ", ".join(slot.strftime("%H:%M") for slot in self.slots)
+        if len(self.weekdays) == 7:
+            return slots
+        days = ",".join(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")[day] for day in sorted(self.weekdays))
+        return f"{slots} on {days}"
@@ -1,10 +1,13 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from time import sleep
 from threading import Thread
 import telebot
 import logging
 
 from source.utils.Constants import AUTOPOST_MEDIA_PATH
+from source.utils.Download import BOT_API_DOWNLOAD_LIMIT, DownloadTooLargeError, check_size, download_bot_file
+from source.utils.MediaGroup import MediaGroupCollector, album_caption
 
 # Suppress verbose telebot logging
 logging.getLogger('TeleBot').setLevel(logging.WARNING)
@@ -19,6 +22,11 @@ class AutoPostReceiver:
         self.bot = telebot.TeleBot(bot_token, parse_mode=None)
         self.thread = None
         self.running = False
+        # Downloads run here so the polling thread keeps handling updates
+        self.download_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="autopost-download")
+        self.max_download_bytes = int(os.getenv("MAX_DOWNLOAD_MB", 0)) * 1024 * 1024 or BOT_API_DOWNLOAD_LIMIT
+        # Photos of an album are queued together as one post
+        self.albums = MediaGroupCollector(self._queue_album)
 
         os.makedirs(AUTOPOST_MEDIA_PATH, exist_ok=True)
 
@@ -34,7 +42,9 @@ class AutoPostReceiver:
 /listchannels - List all configured channels
 /setchannel <id> - Set active posting channel
 /removechannel <id> - Remove a channel
+/settargets all|active|<id> <id>... - Channels each photo is posted to
 /status - Show queue status
+/postnow - Post the next queued photo now
 
 Just send photos to queue them for posting!
             """
@@ -97,6 +107,28 @@ Just send photos to queue them for posting!
             except (IndexError, ValueError):
                 self.bot.reply_to(message, "Usage: /removechannel <channel_id>")
 
+        @self.bot.message_handler(commands=['settargets'])
+        def set_targets(message):
+            if message.from_user.username != self.owner_username:
+                return
+            parts = message.text.split()[1:]
+            try:
+                if not parts:
+                    raise ValueError
+                if parts == ["active"]:
+                    channel_ids = []
+                elif parts == ["all"]:
+                    channel_ids = [int(ch_id) for ch_id in self.config.channels]
+                else:
+                    channel_ids = [int(part) for part in parts]
+            except ValueError:
+                self.bot.reply_to(message, "Usage: /settargets all|active|<channel_id> <channel_id>...")
+                return
+            self.config.set_target_channels(channel_ids)
+            self.autopost_service.set_target_channels(channel_ids)
+            targets = self.autopost_service.get_target_channels()
+            self.bot.reply_to(message, f"✅ New posts go to {len(targets)} channel(s): {', '.join(map(str, targets))}")
+
         @self.bot.message_handler(commands=['status'])
         def show_status(message):
             if message.from_user.username != self.owner_username:
@@ -107,13 +139,30 @@ Just send photos to queue them for posting!
 📊 AutoPost Status:
 
 Active Channel: {active_ch} ({self.config.channel_id})
+Target Channels: {len(status['target_channels'])}
 Total Posts: {status['total']}
 Pending: {status['pending']}
 Posted: {status['posted']}
+Failed Sends: {status['failed_sends']}
 Next Post Time: {status['next_post_time']}
             """
             self.bot.reply_to(message, text)
 
+        @self.bot.message_handler(commands=['postnow'])
+        def post_now(message):
+            if message.from_user.username != self.owner_username:
+                return
+            try:
+                # Posting runs on the Telegram client's loop, not on this polling thread
+                future = self.autopost_service.run_threadsafe(
+                    self.autopost_service.do_post(not_todays_post=True)
+                )
+            except Exception as e:
+                self.bot.reply_to(message, f"❌ Error: {e}")
+                return
+            # Reply once the post finishes instead of blocking the polling thread
+            future.add_done_callback(lambda done: self._report_post(message, done))
+
         @self.bot.message_handler(content_types=["photo"])
         def handle_photo(message):
             if message.from_user.username != self.owner_username:
@@ -123,20 +172,72 @@ Next Post Time: {status['next_post_time']}
                 self.bot.reply_to(message, "❌ No active channel set. Use /addchannel first.")
                 return
 
+            if self.albums.add(message):
+                return
+
             # Get the largest photo
             photo = message.photo[-1]
-            file_info = self.bot.get_file(photo.file_id)
-            downloaded = self.bot.download_file(file_info.file_path)
+            if self.config.use_file_ids:
+                # Posted later by file_id, nothing to download or upload
+                try:
+                    queued = self.autopost_service.queue_file_id(photo.file_id, message.caption or "")
+                    self.bot.reply_to(message, f"✅ Queued for {queued['scheduled_for']}")
+                except Exception as e:
+                    self.bot.reply_to(message, f"❌ Error: {e}")
+                return
+
+            try:
+                check_size(photo.file_size, self.max_download_bytes)
+            except DownloadTooLargeError as e:
+                self.bot.reply_to(message, f"❌ {e}")
+                return
 
-            # Save to disk
-            ext = os.path.splitext(file_info.file_path)[1] or ".jpg"
-            file_name = f"{photo.file_id}{ext}"
-            file_path = os.path.join(AUTOPOST_MEDIA_PATH, file_name)
-            with open(file_path, "wb") as f:
-                f.write(downloaded)
+            self.download_pool.submit(self._queue_photo, message, photo.file_id)
 
+    def _queue_photo(self, message, file_id):
+        """Stream a received photo to disk and queue it (runs on the download pool)."""
+        try:
+            file_path = download_bot_file(
+                self.bot, file_id, AUTOPOST_MEDIA_PATH, file_id,
+                default_ext=".jpg", max_bytes=self.max_download_bytes
+            )
             queued = self.autopost_service.queue_post(file_path, message.caption or "")
             self.bot.reply_to(message, f"✅ Queued for {queued['scheduled_for']}")
+        except Exception as e:
+            self.bot.reply_to(message, f"❌ Error: {e}")
+
+    def _report_post(self, message, future):
+        """Reply to /postnow with the outcome of the finished post."""
+        try:
+            if future.result():
+                self.bot.reply_to(message, "✅ Posted next queued photo")
+            else:
+                self.bot.reply_to(message, "❌ Nothing was posted")
+        except Exception as e:
+            self.bot.reply_to(message, f"❌ Error: {e}")
+
+    def _queue_album(self, messages):
+        """Queue the photos of an album as one post, with a single reply."""
+        first = messages[0]
+        file_ids = [message.photo[-1].file_id for message in messages]
+        caption = album_caption(messages)
+        try:
+            if self.config.use_file_ids:
+                queued = self.autopost_service.queue_album(file_ids=file_ids, caption=caption)
+            else:
+                for message in messages:
+                    check_size(message.photo[-1].file_size, self.max_download_bytes)
+                file_paths = list(self.download_pool.map(
+                    lambda file_id: download_bot_file(
+                        self.bot, file_id, AUTOPOST_MEDIA_PATH, file_id,
+                        default_ext=".jpg", max_bytes=self.max_download_bytes
+                    ),
+                    file_ids
+                ))
+                queued = self.autopost_service.queue_album(photo_paths=file_paths, caption=caption)
+            self.bot.reply_to(first, f"✅ Album of {len(messages)} photos queued for {queued['scheduled_for']}")
+        except Exception as e:
+            self.bot.reply_to(first, f"❌ Error: {e}")
 
     def start(self):
         if self.running:
@@ -6,15 +6,31 @@ them to specified channels at scheduled times.
 
 import os
 from datetime import date, datetime, time, timedelta
-from typing import Optional
-import schedule
-import simplejson as json
-from tinydb import TinyDB, where
+from functools import partial
+from threading import Lock
+from typing import List, Optional
+import telebot
 from telethon import TelegramClient
-from telethon.tl.types import InputPeerChannel
+from telethon.errors import (
+    FileReferenceExpiredError, FilePart0MissingError, FilePartMissingError, FilePartsInvalidError,
+    FloodWaitError, MediaEmptyError
+)
 import asyncio
-from threading import Thread
-from time import sleep
+
+from source.model.AutoPostQueue import AutoPostQueue
+from source.model.PostingSchedule import PostingSchedule
+from source.service.MediaOptimizer import MediaOptimizer
+from source.utils.MediaGroup import MAX_ALBUM_SIZE
+from source.utils.Metrics import (
+    BYTES, FLOOD_WAITS, FLOOD_WAIT_SECONDS, POSTS, QUEUE_DEPTH, SEND_SECONDS, UPLOAD_SECONDS
+)
+
+# Errors meaning the uploaded handle or reused media was rejected, so the file is sent again
+MEDIA_REJECTED_ERRORS = (
+    FileReferenceExpiredError, FilePart0MissingError, FilePartMissingError, FilePartsInvalidError, MediaEmptyError
+)
+# Wait before the scheduler loop tries again after an error
+SCHEDULER_RETRY_SECONDS = 60
 
 
 class AutoPostService:
@@ -22,169 +38,627 @@ class AutoPostService:
     
     Attributes:
         client (TelegramClient): The Telegram client instance
-        db (TinyDB): Database for storing scheduled posts
-        target_time (time): Time of day when posts should be sent
-        channel_id (int): ID of the channel to post to
+        queue (AutoPostQueue): Indexed store for scheduled posts
+        schedule (PostingSchedule): Posting slots or cron schedule
+        channel_id (int): ID of the active channel
+        target_channels (list[int]): Channels new posts go to, the active channel if empty
         running (bool): Flag indicating if scheduler is running
+        loop (AbstractEventLoop): The client's event loop the scheduler task runs on
     """
 
+    # Longest flood wait to sit out before giving up on a channel
+    FLOOD_WAIT_LIMIT = 60
+    # Pre-uploaded files older than this are dropped and uploaded again
+    UPLOAD_MAX_AGE = timedelta(hours=1)
+
     def __init__(self, client: TelegramClient, config: Optional[dict] = None):
         """Initialize AutoPost service.
         
         Args:
             client: Telegram client instance
-            config: Optional configuration dict with channel_id, posting_hour, posting_minute
+            config: Optional configuration dict with channel_id, target_channels, send_concurrency,
+                posting_slots, posting_weekdays, posting_cron, preupload_minutes, optimize_images,
+                bot_token (posting_hour/posting_minute as a single slot)
         """
         self.client = client
         self.config = config or {}
         
-        # Database setup
-        db_path = os.path.join("resources", "autopost_schedule.json")
-        self.db = TinyDB(db_path)
+        # Queue storage
+        self.queue = AutoPostQueue()
         
         # Scheduler configuration
         posting_hour = self.config.get('posting_hour', 13)
         posting_minute = self.config.get('posting_minute', 0)
-        self.target_time = time(int(posting_hour), int(posting_minute))
+        self.schedule = PostingSchedule(
+            slots=self.config.get('posting_slots') or [time(int(posting_hour), int(posting_minute))],
+            weekdays=self.config.get('posting_weekdays'),
+            cron=self.config.get('posting_cron')
+        )
         
         # Channel configuration
         self.channel_id = self.config.get('channel_id')
+        self.target_channels = [int(ch) for ch in self.config.get('target_channels') or []]
+        self._channel_peers = {}  # channel_id -> resolved input peer
+        
+        # Sends to the channels of one post run concurrently, at most this many at once
+        self.send_concurrency = int(self.config.get('send_concurrency', 5))
+        self._send_slots = None
         
-        # Scheduler state
+        # Media of posts due within this window is uploaded ahead of time
+        self.preupload_window = timedelta(minutes=int(self.config.get('preupload_minutes', 10)))
+        self._uploads = {}  # post id -> (uploaded file handles, upload time)
+        
+        # Queued photos are optimised in the background before posting
+        self.optimizer = MediaOptimizer() if self.config.get('optimize_images', True) else None
+        
+        # Posts queued by Telegram file_id are sent through the Bot API
+        self.bot_token = self.config.get('bot_token')
+        self._bot = None
+        
+        # Scheduler state, the scheduler is a task on the client's own loop
         self.running = False
-        self.scheduler_thread = None
+        self.loop = None
+        self._scheduler_task = None
+        self._wakeup = None
+        
+        QUEUE_DEPTH.set_function(self.queue.count_pending, queue="autopost")
 
-    def queue_post(self, photo_path: str, caption: str = "", scheduled_for: Optional[date] = None) -> dict:
-        """Queue a photo for posting.
+    def queue_post(self, photo_path: str, caption: str = "", scheduled_for: Optional[date] = None,
+                   channel_ids: Optional[List[int]] = None) -> dict:
+        """Queue a photo file for posting.
         
         Args:
             photo_path: Path to the photo file
             caption: Caption text for the photo
-            scheduled_for: Optional specific date to post (defaults to next available slot)
+            scheduled_for: Optional date to post on (first slot of that day), defaults to
+                the slot after the last queued post
+            channel_ids: Optional channels to post to, defaults to the target channels
+            
+        Returns:
+            dict: The queued post data
+        """
+        queued = self._queue({"photo_path": photo_path}, caption, scheduled_for, channel_ids)
+        self._optimize(queued)
+        return queued
+
+    def queue_file_id(self, file_id: str, caption: str = "", scheduled_for: Optional[date] = None,
+                      channel_ids: Optional[List[int]] = None) -> dict:
+        """Queue a photo the bot received, by its Telegram file_id.
+        
+        Nothing is downloaded; the photo is posted through the Bot API by file_id,
+        which needs the bot to be an admin of the target channels.
+        
+        Args:
+            file_id: Telegram file_id of the photo
+            caption: Caption text for the photo
+            scheduled_for: Optional date to post on, see queue_post
+            channel_ids: Optional channels to post to, defaults to the target channels
+            
+        Returns:
+            dict: The queued post data
+        """
+        if not self.bot_token:
+            raise ValueError("A bot token is needed to post by file_id")
+        return self._queue({"file_id": file_id, "photo_path": None}, caption, scheduled_for, channel_ids)
+
+    def queue_album(self, photo_paths: Optional[List[str]] = None, file_ids: Optional[List[str]] = None,
+                    caption: str = "", scheduled_for: Optional[date] = None,
+                    channel_ids: Optional[List[int]] = None) -> dict:
+        """Queue several photos to be posted together as one album.
+        
+        Pass either photo_paths (uploaded from disk) or file_ids (sent through the Bot API).
+        
+        Args:
+            photo_paths: Paths of the photo files
+            file_ids: Telegram file_ids of the photos
+            caption: Caption text, shown under the album
+            scheduled_for: Optional date to post on, see queue_post
+            channel_ids: Optional channels to post to, defaults to the target channels
             
         Returns:
             dict: The queued post data
         """
-        if not self.channel_id:
+        files = list(file_ids or photo_paths or [])
+        if not 1 <= len(files) <= MAX_ALBUM_SIZE:
+            raise ValueError(f"An album needs 1 to {MAX_ALBUM_SIZE} photos, got {len(files)}")
+        
+        if file_ids:
+            if not self.bot_token:
+                raise ValueError("A bot token is needed to post by file_id")
+            return self._queue({"file_ids": files, "photo_path": None}, caption, scheduled_for, channel_ids)
+        
+        queued = self._queue({"photo_paths": files, "photo_path": files[0]}, caption, scheduled_for, channel_ids)
+        self._optimize(queued)
+        return queued
+
+    def _queue(self, media: dict, caption: str, scheduled_for: Optional[date],
+               channel_ids: Optional[List[int]]) -> dict:
+        channel_ids = channel_ids or self.get_target_channels()
+        if not channel_ids:
             raise ValueError("No active channel set. Use /addchannel command to add a channel first.")
 
-        # Calculate scheduled date
+        # Take the next free slot from the schedule timeline
         if not scheduled_for:
-            queue_length = self.db.count(where("posted") == 0)
-            today = date.today()
-            date_to_post = today + timedelta(days=queue_length)
-            
-            # If queue is empty and time has passed today, schedule for tomorrow
-            now = datetime.now()
-            if queue_length == 0 and now.time() > self.target_time:
-                date_to_post += timedelta(days=1)
+            after = datetime.now()
+            last_scheduled = self.queue.last_scheduled()
+            if last_scheduled:
+                after = max(after, datetime.fromisoformat(last_scheduled))
+            post_at = self.schedule.next_slot(after)
         else:
-            date_to_post = scheduled_for
+            post_at = self.schedule.next_slot(datetime.combine(scheduled_for, time.min), inclusive=True)
         
         # Create post data
         data = {
-            "photo_path": photo_path,
-            "channel_id": self.channel_id,
+            **media,
+            "channel_id": channel_ids[0],
+            "channel_ids": channel_ids,
             "caption": caption,
-            "scheduled_for": date_to_post.isoformat(),
+            "scheduled_for": post_at.isoformat(),
             "added": datetime.now().isoformat(),
             "posted": 0,
         }
         
-        # Insert into database
-        self.db.insert(data)
+        # Insert into queue and let the scheduler recompute its next wake-up
+        queued = self.queue.insert(data)
+        self.wake()
+        return queued
+
+    def _optimize(self, post: dict):
+        """Optimise a queued photo on the worker pool and record the result in the queue."""
+        if not self.optimizer:
+            return
+        if post.get("photo_paths"):
+            self._optimize_album(post)
+            return
+        
+        future = self.optimizer.submit(post["photo_path"])
+        if future is None:
+            return
         
-        return data
+        def store_result(done):
+            try:
+                result = done.result()
+            except Exception as e:
+                print(f"Error optimising {post['photo_path']}: {e}")
+                return
+            self.queue.update(post["id"], result)
+        
+        future.add_done_callback(store_result)
+
+    def _optimize_album(self, post: dict):
+        """Optimise the photos of an album and record their paths in one update."""
+        paths = post["photo_paths"]
+        optimized = [None] * len(paths)
+        remaining = [len(paths)]
+        lock = Lock()
+        
+        def store_result(index, done):
+            try:
+                optimized[index] = done.result()["optimized_path"] if done is not None else None
+            except Exception as e:
+                print(f"Error optimising {paths[index]}: {e}")
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            self.queue.update(post["id"], {"optimized_paths": optimized})
+        
+        for index, path in enumerate(paths):
+            future = self.optimizer.submit(path)
+            if future is None:
+                store_result(index, None)
+            else:
+                future.add_done_callback(partial(store_result, index))
+
+    @staticmethod
+    def _media_paths(post: dict) -> List[str]:
+        """Get the files to upload for a post, preferring the optimised photos."""
+        paths = post.get("photo_paths") or [post["photo_path"]]
+        optimized = post.get("optimized_paths") or [post.get("optimized_path")]
+        return [
+            optimized_path if optimized_path and os.path.exists(optimized_path) else path
+            for path, optimized_path in zip(paths, optimized + [None] * (len(paths) - len(optimized)))
+        ]
+
+    @staticmethod
+    def _file_ids(post: dict) -> List[str]:
+        """Get the Telegram file_ids of a post queued by file_id."""
+        return post.get("file_ids") or ([post["file_id"]] if post.get("file_id") else [])
 
     async def do_post(self, not_todays_post: bool = False) -> bool:
         """Post a scheduled image.
         
         Args:
-            not_todays_post: If True, post the first queued item regardless of date
+            not_todays_post: If True, post the first queued item even if it is not due yet
             
         Returns:
             bool: True if post was successful, False otherwise
         """
         # Check if there are any posts in queue
-        if len(self.db.all()) == 0:
+        if self.queue.count_pending() == 0:
             print("No posts are scheduled")
             return False
 
         # Get scheduled post
         if not_todays_post:
-            chosen_post = self.db.all()[0]
+            chosen_post = self.queue.first_pending()
         else:
-            is_not_posted = where("posted") == 0
-            is_for_today = where("scheduled_for") == date.today().isoformat()
-            chosen_post = self.db.search((is_not_posted) & (is_for_today))
-            
-            if len(chosen_post) == 0:
-                print("No posts for today")
+            chosen_post = self.queue.next_due(datetime.now().isoformat())
+            if chosen_post is None:
+                print("No posts are due")
                 return False
-            else:
-                chosen_post = chosen_post[0]
 
+        # The pre-upload is used by this attempt whatever its outcome
+        preuploaded = self._take_upload(chosen_post["id"])
         try:
-            # Get channel entity
-            channel = await self.client.get_entity(self.channel_id)
-            
-            # Send photo with caption
-            photo_path = chosen_post["photo_path"]
             caption = chosen_post.get("caption", "")
+            channel_ids = self._post_channels(chosen_post)
             
-            await self.client.send_file(
-                channel,
-                photo_path,
-                caption=caption
-            )
+            file_ids = self._file_ids(chosen_post)
+            if file_ids:
+                # Already on Telegram's servers, no download or upload needed
+                results = await self._publish_file_id(chosen_post["id"], channel_ids, file_ids, caption)
+            else:
+                # Upload once, using the pre-uploaded files when there are some
+                photo_paths = self._media_paths(chosen_post)
+                uploaded = preuploaded or await self._upload(photo_paths)
+                results = await self._publish(chosen_post["id"], channel_ids, uploaded, photo_paths, caption)
+            sent = sum(1 for ok in results.values() if ok)
+            if sent == 0:
+                print(f"Error posting: no channel accepted the post with caption '{caption}'")
+                return False
             
-            # Mark as posted
-            post_query = where("photo_path") == photo_path
-            update_value = {"posted": 1}
-            self.db.update(update_value, post_query)
+            # Mark as posted, failed channels are kept in the post's results
+            self.queue.mark_posted(chosen_post["id"])
             
-            print(f"Post with caption '{caption}' posted successfully")
+            print(f"Post with caption '{caption}' posted to {sent}/{len(channel_ids)} channels")
             return True
             
         except Exception as e:
             print(f"Error posting: {e}")
             return False
 
-    def _scheduler_loop(self):
-        """Internal scheduler loop running in a separate thread."""
-        print(f"Starting AutoPost scheduler - posts will be sent at {self.target_time}")
+    def _take_upload(self, post_id: int) -> Optional[list]:
+        """Remove and return the pre-uploaded files of a post, None if missing or stale."""
+        entry = self._uploads.pop(post_id, None)
+        if entry is None or datetime.now() - entry[1] > self.UPLOAD_MAX_AGE:
+            return None
+        return entry[0]
+
+    def _evict_uploads(self):
+        """Drop pre-uploads that are stale or whose post is no longer pending."""
+        for post_id, (_, uploaded_at) in list(self._uploads.items()):
+            post = self.queue.get(post_id)
+            if post is None or post["posted"] or datetime.now() - uploaded_at > self.UPLOAD_MAX_AGE:
+                self._uploads.pop(post_id, None)
+
+    async def _upload(self, photo_paths: List[str]) -> list:
+        """Upload the files of a post, several at once for albums."""
+        with UPLOAD_SECONDS.time(source="autopost"):
+            uploaded = list(await asyncio.gather(*(self.client.upload_file(path) for path in photo_paths)))
+        BYTES.inc(sum(os.path.getsize(path) for path in photo_paths), source="autopost", direction="upload")
+        return uploaded
+
+    async def _publish(self, post_id: int, channel_ids: List[int], uploaded: list, photo_paths: List[str],
+                       caption: str) -> dict:
+        """Send one post to all its channels.
+        
+        The first channel gets the uploaded files. The media of that message is
+        then reused for the remaining channels, which are sent concurrently and
+        fall back to the photo files if the reused media is rejected. Posts with
+        several files are sent as one album.
+        
+        Args:
+            post_id: ID of the post
+            channel_ids: Target channels
+            uploaded: Uploaded file handles
+            photo_paths: Paths of the photos, used if the upload handles are rejected
+            caption: Caption text
+            
+        Returns:
+            dict: channel_id -> True if sent
+        """
+        # A single file is sent as a photo, a list as an album
+        media = uploaded[0] if len(uploaded) == 1 else uploaded
+        fallback = photo_paths[0] if len(photo_paths) == 1 else photo_paths
+        
+        results = {}
+        remaining = list(channel_ids)
+        first_message = None
+        while remaining and first_message is None:
+            channel_id = remaining.pop(0)
+            first_message = await self._send_to_channel(post_id, channel_id, media, caption, fallback=fallback)
+            results[channel_id] = first_message is not None
+        
+        if first_message is not None and remaining:
+            if isinstance(first_message, list):
+                sent_media = [message.media for message in first_message]
+            else:
+                sent_media = first_message.media
+            messages = await asyncio.gather(*(
+                self._send_to_channel(post_id, channel_id, sent_media, caption, fallback=fallback)
+                for channel_id in remaining
+            ))
+            results.update({channel_id: message is not None for channel_id, message in zip(remaining, messages)})
+        return results
+
+    async def _publish_file_id(self, post_id: int, channel_ids: List[int], file_ids: List[str], caption: str) -> dict:
+        """Send photos by file_id to all their channels concurrently through the Bot API.
+        
+        Returns:
+            dict: channel_id -> True if sent
+        """
+        messages = await asyncio.gather(*(
+            self._send_with_bot(post_id, channel_id, file_ids, caption) for channel_id in channel_ids
+        ))
+        return {channel_id: message is not None for channel_id, message in zip(channel_ids, messages)}
+
+    async def _send_with_bot(self, post_id: int, channel_id: int, file_ids: List[str], caption: str):
+        """Send photos by file_id to one channel and record the outcome.
+        
+        One file_id is sent as a photo, several as a media group. The blocking
+        Bot API call runs in the loop's default executor.
+        
+        Returns:
+            The sent message (list of messages for albums), or None if sending failed
+        """
+        loop = asyncio.get_running_loop()
+        if len(file_ids) == 1:
+            send = partial(self.bot.send_photo, channel_id, file_ids[0], caption=caption or None)
+        else:
+            album = [
+                telebot.types.InputMediaPhoto(file_id, caption=caption if index == 0 and caption else None)
+                for index, file_id in enumerate(file_ids)
+            ]
+            send = partial(self.bot.send_media_group, channel_id, album)
+        async with self._get_send_slots():
+            try:
+                try:
+                    with SEND_SECONDS.time(source="autopost"):
+                        message = await loop.run_in_executor(None, send)
+                except telebot.apihelper.ApiTelegramException as e:
+                    retry_after = (e.result_json or {}).get("parameters", {}).get("retry_after")
+                    if e.error_code == 429 and retry_after:
+                        self._count_flood_wait(retry_after)
+                    if e.error_code != 429 or not retry_after or retry_after > self.FLOOD_WAIT_LIMIT:
+                        raise
+                    print(f"Flood wait of {retry_after}s for {channel_id}, waiting")
+                    await asyncio.sleep(retry_after)
+                    with SEND_SECONDS.time(source="autopost"):
+                        message = await loop.run_in_executor(None, send)
+                first = message[0] if isinstance(message, list) else message
+                self.queue.record_result(post_id, channel_id, "sent", message_id=first.message_id)
+                POSTS.inc(source="autopost", group="autopost", channel=channel_id, result="ok")
+                return message
+            except Exception as e:
+                print(f"Error posting to {channel_id}: {e}")
+                self.queue.record_result(post_id, channel_id, "failed", error=str(e))
+                POSTS.inc(source="autopost", group="autopost", channel=channel_id, result="error")
+                return None
+
+    @staticmethod
+    def _count_flood_wait(seconds: int):
+        FLOOD_WAITS.inc(source="autopost")
+        FLOOD_WAIT_SECONDS.observe(seconds, source="autopost")
+
+    @property
+    def bot(self):
+        """Bot API client used for file_id posts."""
+        if self._bot is None:
+            self._bot = telebot.TeleBot(self.bot_token, parse_mode=None)
+        return self._bot
+
+    def _get_send_slots(self) -> asyncio.Semaphore:
+        if self._send_slots is None:
+            self._send_slots = asyncio.Semaphore(self.send_concurrency)
+        return self._send_slots
+
+    async def _send_to_channel(self, post_id: int, channel_id: int, media, caption: str, fallback=None):
+        """Send media to one channel under the concurrency limit and record the outcome.
+        
+        Args:
+            post_id: ID of the post
+            channel_id: Target channel
+            media: Uploaded file handle or media of an already sent message, a list for albums
+            caption: Caption text
+            fallback: File (list for albums) to send instead if media is rejected
+            
+        Returns:
+            The sent message (list of messages for albums), or None if sending failed
+        """
+        async with self._get_send_slots():
+            attempts = [media] + ([fallback] if fallback else [])
+            error = None
+            for index, file in enumerate(attempts):
+                try:
+                    channel = await self._get_channel_peer(channel_id)
+                    try:
+                        with SEND_SECONDS.time(source="autopost"):
+                            message = await self.client.send_file(channel, file, caption=caption)
+                    except FloodWaitError as e:
+                        self._count_flood_wait(e.seconds)
+                        if e.seconds > self.FLOOD_WAIT_LIMIT:
+                            raise
+                        print(f"Flood wait of {e.seconds}s for {channel_id}, waiting")
+                        await asyncio.sleep(e.seconds)
+                        with SEND_SECONDS.time(source="autopost"):
+                            message = await self.client.send_file(channel, file, caption=caption)
+                    first = message[0] if isinstance(message, list) else message
+                    self.queue.record_result(post_id, channel_id, "sent", message_id=first.id)
+                    POSTS.inc(source="autopost", group="autopost", channel=channel_id, result="ok")
+                    return message
+                except MEDIA_REJECTED_ERRORS as e:
+                    error = e
+                    if index + 1 < len(attempts):
+                        print(f"Media rejected by {channel_id} ({e}), sending the file again")
+                except Exception as e:
+                    # Flood waits and other errors would hit the fallback just the same
+                    error = e
+                    break
+            
+            print(f"Error posting to {channel_id}: {error}")
+            self.queue.record_result(post_id, channel_id, "failed", error=str(error))
+            POSTS.inc(source="autopost", group="autopost", channel=channel_id, result="error")
+            return None
+
+    def _post_channels(self, post: dict) -> List[int]:
+        """Get the target channels of a queued post."""
+        return post.get("channel_ids") or [post.get("channel_id") or self.channel_id]
+
+    async def _scheduler_loop(self):
+        """Scheduler task running on the client's event loop.
         
-        # Schedule daily post
-        scheduled_time = f"{self.target_time.hour:02d}:{self.target_time.minute:02d}"
-        schedule.every().day.at(scheduled_time).do(self._run_async_post)
+        Sleeps until the next posting time instead of polling, and is woken
+        early whenever the queue changes.
+        """
+        print(f"Starting AutoPost scheduler - posts will be sent at {self.schedule}")
         
         while self.running:
-            schedule.run_pending()
-            sleep(1)
+            try:
+                next_run = self._next_run_time()
+                if next_run is None:
+                    await self._sleep(None)
+                    continue
 
-    def _run_async_post(self):
-        """Helper to run async post in sync scheduler context."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+                # Upload ahead so only the send request is left at posting time
+                prepare_at = next_run - self.preupload_window
+                if await self._sleep((prepare_at - datetime.now()).total_seconds()):
+                    continue
+                await self._prepare_post(next_run)
+                if await self._sleep((next_run - datetime.now()).total_seconds()):
+                    continue
+
+                await self.do_post()
+            except Exception as e:
+                # Keep the task alive, e.g. when the schedule has no upcoming slot
+                print(f"Error in AutoPost scheduler: {e}")
+                await self._sleep(SCHEDULER_RETRY_SECONDS)
+
+    async def _prepare_post(self, run_at: datetime):
+        """Pre-upload the media of the post due at run_at and resolve its channel.
+        
+        Args:
+            run_at: Time the next post will be sent
+        """
+        self._evict_uploads()
+        post = self.queue.next_due(run_at.isoformat())
+        if post is None or post["id"] in self._uploads or self._file_ids(post):
+            return
         try:
-            loop.run_until_complete(self.do_post())
+            for channel_id in self._post_channels(post):
+                await self._get_channel_peer(channel_id)
+            photo_paths = self._media_paths(post)
+            self._uploads[post["id"]] = (await self._upload(photo_paths), datetime.now())
+            print(f"Pre-uploaded {', '.join(photo_paths)} for {run_at}")
+        except Exception as e:
+            print(f"Error pre-uploading {post['photo_path']}: {e}")
+
+    async def _get_channel_peer(self, channel_id: int):
+        """Resolve a channel ID to an input peer once and cache it.
+        
+        Args:
+            channel_id: Telegram channel ID
+            
+        Returns:
+            The resolved input peer
+        """
+        peer = self._channel_peers.get(channel_id)
+        if peer is None:
+            peer = await self.client.get_input_entity(channel_id)
+            self._channel_peers[channel_id] = peer
+        return peer
+
+    def _next_run_time(self) -> Optional[datetime]:
+        """Get when the next queued post is due.
+        
+        Returns:
+            datetime: Next posting time, or None if the queue is empty
+        """
+        next_post = self.queue.first_pending()
+        if next_post is None:
+            return None
+        
+        due_at = self._due_time(next_post)
+        now = datetime.now()
+        # Overdue posts (e.g. after downtime) go out at the next slot, not all at once
+        return due_at if due_at > now else self.schedule.next_slot(now)
+
+    def _due_time(self, post: dict) -> datetime:
+        """Get when a post is due, mapping date-only entries to their first slot."""
+        scheduled_for = post["scheduled_for"]
+        if len(scheduled_for) == 10:
+            day_start = datetime.combine(date.fromisoformat(scheduled_for), time.min)
+            return self.schedule.next_slot(day_start, inclusive=True)
+        return datetime.fromisoformat(scheduled_for)
+
+    async def _sleep(self, delay: Optional[float]) -> bool:
+        """Sleep for delay seconds or until woken.
+        
+        Args:
+            delay: Seconds to sleep, None to sleep until woken
+            
+        Returns:
+            bool: True if woken early, False if the delay elapsed
+        """
+        try:
+            if delay is None or delay > 0:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                return True
+            return False
+        except asyncio.TimeoutError:
+            return False
         finally:
-            loop.close()
+            self._wakeup.clear()
+
+    def _call_in_loop(self, callback):
+        """Run a callback on the client's loop, crossing threads safely."""
+        try:
+            current_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+        if current_loop is self.loop:
+            callback()
+        else:
+            self.loop.call_soon_threadsafe(callback)
+
+    def run_threadsafe(self, coro):
+        """Submit a coroutine to the client's loop from another thread.
+        
+        Args:
+            coro: Coroutine to run, e.g. ``do_post()``
+            
+        Returns:
+            concurrent.futures.Future: Future with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.client.loop)
+
+    def wake(self):
+        """Wake the scheduler so it recomputes the next posting time."""
+        if self.running and self._wakeup is not None:
+            self._call_in_loop(self._wakeup.set)
+
+    def _start_task(self):
+        self._wakeup = asyncio.Event()
+        self._scheduler_task = self.loop.create_task(self._scheduler_loop())
+
+    def _cancel_task(self):
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
+            self._scheduler_task = None
 
     def start_scheduler(self):
-        """Start the background scheduler."""
+        """Start the scheduler task on the client's event loop."""
         if not self.running:
             self.running = True
-            self.scheduler_thread = Thread(target=self._scheduler_loop, daemon=True)
-            self.scheduler_thread.start()
+            self.loop = self.client.loop
+            self._call_in_loop(self._start_task)
             print("AutoPost scheduler started")
 
     def stop_scheduler(self):
-        """Stop the background scheduler."""
+        """Stop the scheduler task."""
         if self.running:
             self.running = False
-            if self.scheduler_thread:
-                self.scheduler_thread.join(timeout=2)
+            self._call_in_loop(self._cancel_task)
             print("AutoPost scheduler stopped")
 
     def get_queue_status(self) -> dict:
@@ -193,16 +667,14 @@ class AutoPostService:
         Returns:
             dict: Queue statistics
         """
-        all_posts = self.db.all()
-        pending = self.db.count(where("posted") == 0)
-        posted = self.db.count(where("posted") == 1)
-        
         return {
-            "total": len(all_posts),
-            "pending": pending,
-            "posted": posted,
-            "next_post_time": f"{self.target_time}",
-            "channel_id": self.channel_id
+            "total": self.queue.count(),
+            "pending": self.queue.count_pending(),
+            "posted": self.queue.count_posted(),
+            "failed_sends": self.queue.count_failed(),
+            "next_post_time": f"{self._next_run_time() or self.schedule}",
+            "channel_id": self.channel_id,
+            "target_channels": self.get_target_channels()
         }
 
     def get_pending_posts(self) -> list:
@@ -211,11 +683,12 @@ class AutoPostService:
         Returns:
             list: List of pending post dicts
         """
-        return self.db.search(where("posted") == 0)
+        return self.queue.pending()
 
     def clear_posted(self):
         """Remove all posted items from queue."""
-        self.db.remove(where("posted") == 1)
+        self.queue.clear_posted()
+        self._evict_uploads()
         print("Cleared all posted items from queue")
 
     def set_channel(self, channel_id: int):
@@ -226,3 +699,18 @@ class AutoPostService:
         """
         self.channel_id = channel_id
         self.config['channel_id'] = channel_id
+
+    def set_target_channels(self, channel_ids: List[int]):
+        """Set the channels new posts are sent to.
+        
+        Args:
+            channel_ids: Telegram channel IDs, empty for the active channel only
+        """
+        self.target_channels = [int(ch) for ch in channel_ids]
+        self.config['target_channels'] = self.target_channels
+
+    def get_target_channels(self) -> List[int]:
+        """Get the channels new posts are sent to."""
+        if self.target_channels:
+            return list(self.target_channels)
+        return [self.channel_id] if self.channel_id else []
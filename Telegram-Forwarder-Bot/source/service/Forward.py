@@ -94,7 +94,7 @@ class Forward:
             source: Source chat ID
             last_message_id: ID of last processed message
         """
-        messages = await self.client.get_messages(source, min_id=last_message_id, limit=None)
+        messages = await self._get_history_window(source, last_message_id)
         destination_id = self._get_destination_id(source)
 
         for message in reversed(messages):
@@ -105,6 +105,46 @@ class Forward:
             except Exception as e:
                 print(f"Error forwarding message: {e}")
 
+    async def _get_history_window(self, source: int, last_message_id: int) -> List[Message]:
+        """Fetch only the messages inside the configured history window.
+        
+        Messages are requested newest first starting at the window's upper bound,
+        and paging stops as soon as the lower bound or the message limit is reached,
+        so Telegram is never asked for history outside the window.
+        
+        Args:
+            source: Source chat ID
+            last_message_id: ID of last processed message
+            
+        Returns:
+            Messages inside the window, newest first
+        """
+        config = self.forward_config_map.get(source)
+        window = config.get_history_window() if config else {}
+
+        min_id = last_message_id
+        if window.get("min_id") is not None:
+            min_id = max(min_id, window["min_id"] - 1)
+        max_id = window["max_id"] + 1 if window.get("max_id") is not None else 0
+        from_date = window.get("from_date")
+        to_date = window.get("to_date")
+        if (from_date and to_date and from_date >= to_date) or (max_id and min_id >= max_id - 1):
+            print(f"Empty history window for {source}, nothing to forward")
+            return []
+
+        messages = []
+        async for message in self.client.iter_messages(
+            source,
+            limit=window.get("last_n"),
+            offset_date=to_date,
+            min_id=min_id,
+            max_id=max_id
+        ):
+            if from_date and message.date < from_date:
+                break
+            messages.append(message)
+        return messages
+
     def _get_destination_id(self, source_id: int) -> Optional[int]:
         """Get destination chat ID for a source chat.
         
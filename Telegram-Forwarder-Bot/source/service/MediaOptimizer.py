@@ -0,0 +1,131 @@
+"""Image optimisation for queued AutoPost photos.
+
+Photos are resized to Telegram's photo limits and re-encoded as JPEG without
+metadata; the result is only used when it is smaller than the original. Work
+runs on a worker pool and results are cached by content hash, so the same
+photo is only processed once.
+"""
+
+import hashlib
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from source.utils.Constants import AUTOPOST_OPTIMIZED_PATH
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional, photos are then queued as received
+    Image = None
+    ImageOps = None
+
+# Telegram shows photos at most 2560px on the long side and rejects photos over 10 MB
+MAX_PHOTO_SIDE = 2560
+MAX_PHOTO_BYTES = 10 * 1024 * 1024
+JPEG_QUALITY = 87
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tif", ".tiff")
+
+
+def file_hash(path: str) -> str:
+    """Get the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _save_jpeg(image, path: str, quality: int):
+    temp_path = path + ".part"
+    image.save(temp_path, "JPEG", quality=quality, optimize=True, progressive=True)
+    os.replace(temp_path, path)
+
+
+def _to_rgb(image):
+    """Convert an image to RGB, putting transparent areas on white instead of black."""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB") if image.mode != "RGB" else image
+
+
+def optimize_image(path: str, output_dir: str = AUTOPOST_OPTIMIZED_PATH) -> dict:
+    """Resize and re-encode one photo.
+
+    Args:
+        path: Path of the original photo
+        output_dir: Directory for optimised files
+
+    Returns:
+        dict: source_hash, optimized_path (None if the result is not smaller
+        than the original), original_bytes, optimized_bytes
+    """
+    source_hash = file_hash(path)
+    optimized_path = os.path.join(output_dir, f"{source_hash}.jpg")
+    original_bytes = os.path.getsize(path)
+
+    if not os.path.exists(optimized_path):
+        os.makedirs(output_dir, exist_ok=True)
+        with Image.open(path) as original:
+            # Apply EXIF rotation before the metadata is dropped
+            image = _to_rgb(ImageOps.exif_transpose(original))
+            image.thumbnail((MAX_PHOTO_SIDE, MAX_PHOTO_SIDE), Image.LANCZOS)
+
+            quality = JPEG_QUALITY
+            _save_jpeg(image, optimized_path, quality)
+            while os.path.getsize(optimized_path) > MAX_PHOTO_BYTES and quality > 50:
+                quality -= 10
+                _save_jpeg(image, optimized_path, quality)
+
+    optimized_bytes = os.path.getsize(optimized_path)
+    if optimized_bytes >= original_bytes:
+        # Re-encoding did not help, the original is posted as it is
+        os.remove(optimized_path)
+        optimized_path = None
+
+    return {
+        "source_hash": source_hash,
+        "optimized_path": optimized_path,
+        "original_bytes": original_bytes,
+        "optimized_bytes": optimized_bytes,
+    }
+
+
+class MediaOptimizer:
+    """Runs photo optimisation on a worker pool.
+
+    Attributes:
+        output_dir (str): Directory for optimised files
+        enabled (bool): False when Pillow is not installed
+    """
+
+    def __init__(self, output_dir: str = AUTOPOST_OPTIMIZED_PATH, max_workers: int = 2):
+        """Initialize the optimizer.
+
+        Args:
+            output_dir: Directory for optimised files
+            max_workers: Number of worker threads
+        """
+        self.output_dir = output_dir
+        self.enabled = Image is not None
+        # Pillow releases the GIL while decoding, resizing and encoding, so threads are enough
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="media-optimizer")
+
+    def submit(self, path: str) -> Optional[Future]:
+        """Start optimising a photo.
+
+        Args:
+            path: Path of the photo
+
+        Returns:
+            Future: Resolves to the optimize_image result, None if the file is skipped
+        """
+        if not self.enabled or not path.lower().endswith(IMAGE_EXTENSIONS):
+            return None
+        return self._executor.submit(optimize_image, path, self.output_dir)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -2,9 +2,13 @@ import os
 from typing import Optional, List
 
 from telethon import TelegramClient
+from telethon.errors import FloodWaitError
 from telethon.tl.custom import Message
 
 from source.utils.Constants import MEDIA_FOLDER_PATH
+from source.utils.Metrics import (
+    BYTES, DOWNLOAD_SECONDS, FLOOD_WAITS, FLOOD_WAIT_SECONDS, MESSAGES_FORWARDED, SEND_SECONDS
+)
 
 
 class MessageForwardService:
@@ -19,9 +23,13 @@ class MessageForwardService:
         self.client = client
 
     async def forward_message(self, destination_id: int, message: Message, reply_to: Optional[int] = None) -> Optional[Message]:
+        kind = "forward" if message.forward is not None else "media" if message.media else "text"
         try:
             if message.forward is not None:
-                return await self.client.forward_messages(destination_id, message)
+                with SEND_SECONDS.time(source="forward"):
+                    sent = await self.client.forward_messages(destination_id, message)
+                self._count(message.chat_id, destination_id, kind, "ok")
+                return sent
 
             media_path = None
             try:
@@ -30,25 +38,31 @@ class MessageForwardService:
                 
                 text = message.text or ''
                 
+                with SEND_SECONDS.time(source="forward"):
+                    if media_path:
+                        sent = await self.client.send_file(
+                            destination_id,
+                            media_path,
+                            caption=text,
+                            reply_to=reply_to
+                        )
+                    else:
+                        sent = await self.client.send_message(
+                            destination_id,
+                            text,
+                            reply_to=reply_to
+                        )
                 if media_path:
-                    return await self.client.send_file(
-                        destination_id,
-                        media_path,
-                        caption=text,
-                        reply_to=reply_to
-                    )
-                else:
-                    return await self.client.send_message(
-                        destination_id,
-                        text,
-                        reply_to=reply_to
-                    )
+                    BYTES.inc(os.path.getsize(media_path), source="forward", direction="upload")
+                self._count(message.chat_id, destination_id, kind, "ok")
+                return sent
             finally:
                 if media_path:
                     self._delete_media(media_path)
 
         except Exception as e:
             print(f"Error sending message: {e}")
+            self._count(message.chat_id, destination_id, kind, "error", e)
             return None
 
     async def forward_album(
@@ -61,22 +75,39 @@ class MessageForwardService:
         media_paths = []
         try:
             media_paths = await self._download_album_media(messages)
-            return await self.client.send_file(
-                destination_id,
-                media_paths,
-                caption=caption,
-                reply_to=reply_to
-            )
+            with SEND_SECONDS.time(source="forward"):
+                sent = await self.client.send_file(
+                    destination_id,
+                    media_paths,
+                    caption=caption,
+                    reply_to=reply_to
+                )
+            BYTES.inc(sum(os.path.getsize(path) for path in media_paths), source="forward", direction="upload")
+            self._count(messages[0].chat_id, destination_id, "album", "ok")
+            return sent
         except Exception as e:
             print(f"Error forwarding album: {e}")
+            self._count(messages[0].chat_id, destination_id, "album", "error", e)
             return None
         finally:
             self._cleanup_media(media_paths)
 
+    @staticmethod
+    def _count(source_id: int, destination_id: int, kind: str, result: str,
+               error: Optional[Exception] = None) -> None:
+        MESSAGES_FORWARDED.inc(source_chat=source_id, destination=destination_id, kind=kind, result=result)
+        if isinstance(error, FloodWaitError):
+            FLOOD_WAITS.inc(source="forward")
+            FLOOD_WAIT_SECONDS.observe(error.seconds, source="forward")
+
     async def _download_media(self, message: Message) -> Optional[str]:
         try:
             os.makedirs(MEDIA_FOLDER_PATH, exist_ok=True)
-            return await self.client.download_media(message, file=MEDIA_FOLDER_PATH)
+            with DOWNLOAD_SECONDS.time(source="forward"):
+                path = await self.client.download_media(message, file=MEDIA_FOLDER_PATH)
+            if path:
+                BYTES.inc(os.path.getsize(path), source="forward", direction="download")
+            return path
         except Exception as e:
             print(f"Error downloading media: {e}")
             return None
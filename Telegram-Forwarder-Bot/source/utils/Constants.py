@@ -6,9 +6,12 @@ HISTORY_FILE_PATH = f"{RESOURCE_FILE_PATH}/history.json"
 IGNORE_CHATS_FILE_PATH = f"{RESOURCE_FILE_PATH}/ignoreChats.json"
 WANTED_USER_FILE_PATH = f"{RESOURCE_FILE_PATH}/wantedUser.json"
 AUTOPOST_CONFIG_FILE_PATH = f"{RESOURCE_FILE_PATH}/autopostConfig.json"
+AUTOPOST_QUEUE_FILE_PATH = f"{RESOURCE_FILE_PATH}/autopost_queue.db"
+AUTOPOST_SCHEDULE_FILE_PATH = f"{RESOURCE_FILE_PATH}/autopost_schedule.json"
 
 MEDIA_FOLDER_PATH = "media"
 AUTOPOST_MEDIA_PATH = f"{MEDIA_FOLDER_PATH}/autopost"
+AUTOPOST_OPTIMIZED_PATH = f"{AUTOPOST_MEDIA_PATH}/optimized"
 
 SESSION_FOLDER_PATH = "sessions"
 SESSION_PREFIX_PATH = f"{SESSION_FOLDER_PATH}/session_"
@@ -0,0 +1,88 @@
+"""Streaming downloads of files sent to a Telegram bot.
+
+``TeleBot.download_file`` returns the whole file as bytes. These helpers
+stream it to a temporary file in chunks and rename it into place, so memory
+use stays at one chunk regardless of the file size.
+"""
+
+import os
+import tempfile
+from typing import Optional
+
+import requests
+from telebot import apihelper
+
+# The Bot API refuses to serve files larger than 20 MB
+BOT_API_DOWNLOAD_LIMIT = 20 * 1024 * 1024
+CHUNK_SIZE = 256 * 1024
+
+
+class DownloadTooLargeError(ValueError):
+    """Raised when a file is larger than the allowed download size."""
+
+    def __init__(self, size: int, max_bytes: int):
+        super().__init__(f"File is {size / 1024 / 1024:.1f} MB, the limit is {max_bytes / 1024 / 1024:.0f} MB")
+        self.size = size
+        self.max_bytes = max_bytes
+
+
+def check_size(size: Optional[int], max_bytes: int = BOT_API_DOWNLOAD_LIMIT):
+    """Raise DownloadTooLargeError if a known file size is over the limit."""
+    if size and size > max_bytes:
+        raise DownloadTooLargeError(size, max_bytes)
+
+
+def _file_url(bot, file_path: str) -> str:
+    if apihelper.FILE_URL is None:
+        return f"https://api.telegram.org/file/bot{bot.token}/{file_path}"
+    return apihelper.FILE_URL.format(bot.token, file_path)
+
+
+def download_bot_file(bot, file_id: str, directory: str, name: str, default_ext: str = "",
+                      max_bytes: int = BOT_API_DOWNLOAD_LIMIT) -> str:
+    """Stream a file sent to the bot into a directory.
+
+    The file is written to a temporary file next to its destination and
+    renamed once complete, so readers never see a partial file.
+
+    Args:
+        bot: TeleBot instance that received the file
+        file_id: Telegram file ID
+        directory: Destination directory
+        name: File name without extension
+        default_ext: Extension used when Telegram's file path has none
+        max_bytes: Largest file to accept
+
+    Returns:
+        str: Path of the downloaded file
+    """
+    file_info = bot.get_file(file_id)
+    check_size(file_info.file_size, max_bytes)
+
+    ext = os.path.splitext(file_info.file_path)[1] or default_ext
+    destination = os.path.join(directory, f"{name}{ext}")
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as file, requests.get(
+            _file_url(bot, file_info.file_path),
+            stream=True,
+            timeout=(10, 60),
+            proxies=apihelper.proxy
+        ) as response:
+            response.raise_for_status()
+            written = 0
+            for chunk in response.iter_content(CHUNK_SIZE):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise DownloadTooLargeError(written, max_bytes)
+                file.write(chunk)
+        os.replace(temp_path, destination)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return destination
@@ -0,0 +1,69 @@
+"""Collection of Telegram albums (media groups) sent to a bot.
+
+Telegram delivers an album as separate messages that share a
+``media_group_id``, with no marker for the last one. The collector buffers
+them and hands the whole album to a callback once no new part has arrived
+for a short window.
+"""
+
+import threading
+from typing import Callable
+
+# Telegram sends the parts of an album within a second or so of each other
+ALBUM_WINDOW_SECONDS = 1.5
+MAX_ALBUM_SIZE = 10
+
+
+class MediaGroupCollector:
+    """Buffers album messages by media_group_id.
+
+    Attributes:
+        on_album (Callable): Called with the album's messages in message order
+        window (float): Seconds without a new part before an album is complete
+    """
+
+    def __init__(self, on_album: Callable[[list], None], window: float = ALBUM_WINDOW_SECONDS):
+        """Initialize the collector.
+
+        Args:
+            on_album: Callback receiving the list of messages of one album, runs on a timer thread
+            window: Seconds without a new part before an album is complete
+        """
+        self.on_album = on_album
+        self.window = window
+        self._lock = threading.Lock()
+        self._albums = {}  # media_group_id -> {"messages": [...], "timer": Timer}
+
+    def add(self, message) -> bool:
+        """Buffer a message if it is part of an album.
+
+        Args:
+            message: Received telebot message
+
+        Returns:
+            bool: True if the message was buffered, False if it is not part of an album
+        """
+        group_id = getattr(message, "media_group_id", None)
+        if not group_id:
+            return False
+
+        with self._lock:
+            album = self._albums.setdefault(group_id, {"messages": [], "timer": None})
+            if album["timer"] is not None:
+                album["timer"].cancel()
+            album["messages"].append(message)
+            album["timer"] = threading.Timer(self.window, self._complete, args=(group_id,))
+            album["timer"].daemon = True
+            album["timer"].start()
+        return True
+
+    def _complete(self, group_id: str):
+        with self._lock:
+            album = self._albums.pop(group_id, None)
+        if album:
+            self.on_album(sorted(album["messages"], key=lambda message: message.message_id))
+
+
+def album_caption(messages: list) -> str:
+    """Get the caption of an album, which Telegram attaches to one of its parts."""
+    return next((message.caption for message in messages if message.caption), "")
@@ -0,0 +1,152 @@
+"""Content-addressed storage for media files.
+
+Files are stored under their SHA-256 digest, so two uploads never overwrite
+each other and an identical file is kept only once. The store does not track
+who uses a file: callers pass reference counts (path -> number of content
+items using it) to ``collect`` and ``over_quota``, which decide what can be
+deleted.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Tuple
+
+CHUNK_SIZE = 256 * 1024
+# Unreferenced files younger than this may still be waiting to be added to content
+GRACE_SECONDS = 3600
+
+
+class MediaStore:
+    """Media files stored by content hash.
+
+    Attributes:
+        root (str): Directory holding the store, files live in root/<2 hex>/<digest><ext>
+        quota_bytes (int): Largest total size before over_quota evicts, 0 for no quota
+        grace_seconds (float): Age before an unreferenced file is collected
+    """
+
+    def __init__(self, root: str, quota_bytes: int = 0, grace_seconds: float = GRACE_SECONDS):
+        """Initialize the store.
+
+        Args:
+            root: Directory holding the store
+            quota_bytes: Largest total size before over_quota evicts, 0 for no quota
+            grace_seconds: Age before a file is collected or evicted
+        """
+        self.root = os.path.abspath(root)
+        self.quota_bytes = quota_bytes
+        self.grace_seconds = grace_seconds
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def incoming_name(self) -> str:
+        """Unique file name (without extension) for a download into the store root."""
+        return f"incoming_{uuid.uuid4().hex}"
+
+    def add(self, path: str) -> str:
+        """Move a file into the store under its digest.
+
+        If the store already holds the same content, the new file is deleted
+        and the existing one is returned.
+
+        Args:
+            path: File to add, removed or moved by this call
+
+        Returns:
+            str: Path of the stored file
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+        ext = os.path.splitext(path)[1].lower()
+        destination = os.path.join(self.root, digest[:2], f"{digest}{ext}")
+
+        with self._lock:
+            if os.path.exists(destination):
+                os.remove(path)
+                # A fresh mtime keeps the file out of collect until it is referenced
+                os.utime(destination)
+            else:
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                os.replace(path, destination)
+        return destination
+
+    def owns(self, path: str) -> bool:
+        """Whether a path lies inside the store."""
+        return bool(path) and os.path.abspath(path).startswith(self.root + os.sep)
+
+    def files(self) -> List[Tuple[str, int, float]]:
+        """All files in the store as (path, size, mtime), oldest first."""
+        result = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                result.append((path, stat.st_size, stat.st_mtime))
+        return sorted(result, key=lambda entry: entry[2])
+
+    def usage(self) -> int:
+        """Total size of the store in bytes."""
+        return sum(size for _, size, _ in self.files())
+
+    def collect(self, refs: Dict[str, int]) -> List[Tuple[str, int]]:
+        """Delete files no content refers to.
+
+        Args:
+            refs: Reference count per file path
+
+        Returns:
+            list: (path, size) of the deleted files
+        """
+        refs = {os.path.abspath(path): count for path, count in refs.items()}
+        cutoff = time.time() - self.grace_seconds
+        deleted = []
+        with self._lock:
+            for path, size, mtime in self.files():
+                if refs.get(path, 0) > 0 or mtime > cutoff:
+                    continue
+                try:
+                    os.remove(path)
+                    deleted.append((path, size))
+                except OSError:
+                    pass
+        return deleted
+
+    def over_quota(self, refs: Dict[str, int]) -> List[Tuple[str, int]]:
+        """Files to evict to get back under the quota.
+
+        Unreferenced files go first, then referenced ones from the oldest.
+        Files younger than grace_seconds are never evicted, they may belong
+        to content that is still being added. Run collect first, so files
+        nothing uses are already gone.
+
+        Args:
+            refs: Reference count per file path
+
+        Returns:
+            list: (path, size) of the files to evict, empty if within the quota
+        """
+        if not self.quota_bytes:
+            return []
+        files = self.files()
+        excess = sum(size for _, size, _ in files) - self.quota_bytes
+        refs = {os.path.abspath(path): count for path, count in refs.items()}
+        cutoff = time.time() - self.grace_seconds
+        files.sort(key=lambda entry: (refs.get(entry[0], 0) > 0, entry[2]))
+        evict = []
+        for path, size, mtime in files:
+            if excess <= 0:
+                break
+            if mtime > cutoff:
+                continue
+            evict.append((path, size))
+            excess -= size
+        return evict
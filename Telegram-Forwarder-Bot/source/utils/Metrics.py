@@ -0,0 +1,254 @@
+"""In-process metrics in the Prometheus text format.
+
+A small registry of counters, gauges and histograms with labels, rendered by
+``Registry.exposition`` in the Prometheus text exposition format (0.0.4), so
+any Prometheus-compatible scraper can read it without extra packages. The
+metrics shared by the services and the web app are defined at the bottom.
+"""
+
+import abc
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Seconds, from a fast API call to a slow upload
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric(abc.ABC):
+    """Base of all metric types, holding one value per label combination.
+
+    Attributes:
+        name (str): Metric name
+        documentation (str): HELP text
+        labelnames (tuple): Names of the labels every sample must set
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        """Initialize the metric.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample must set
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} needs labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...], extra: Optional[Dict[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    @abc.abstractmethod
+    def samples(self) -> Iterable[str]:
+        """Sample lines of this metric."""
+
+    def exposition(self) -> str:
+        """HELP, TYPE and sample lines of this metric."""
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Value that only goes up."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        """Add to the counter of a label combination."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{self._labels(key)} {_format(value)}" for key, value in sorted(values.items())]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a function at scrape time."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            current = self._values.get(key, 0)
+            self._values[key] = (current() if callable(current) else current) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float], **labels):
+        """Read the value of a label combination from function on every scrape."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = function
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = dict(self._values)
+        lines = []
+        for key, value in sorted(values.items(), key=lambda item: item[0]):
+            if callable(value):
+                try:
+                    value = value()
+                except Exception:
+                    continue
+            lines.append(f"{self.name}{self._labels(key)} {_format(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        """Initialize the histogram.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample must set
+            buckets: Upper bounds of the buckets, +Inf is added
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = {key: (list(counts), total) for key, (counts, total) in self._values.items()}
+        lines = []
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{self._labels(key, {'le': _format(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Named metrics of one process.
+
+    Registering a name twice returns the existing metric, so modules can
+    declare the metrics they use without coordinating.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def exposition(self) -> str:
+        """All metrics in the Prometheus text format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return "\n".join(metric.exposition() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# Metrics shared by the services and web_auth; "source" tells which part of the app recorded them,
+# "source_chat" and "destination" name the chats of a forwarding route
+MESSAGES_FORWARDED = REGISTRY.counter(
+    "zerohook_messages_forwarded_total", "Messages forwarded by forwarding routes",
+    ("source_chat", "destination", "kind", "result"))
+POSTS = REGISTRY.counter(
+    "zerohook_posts_total", "Scheduled posts sent per channel", ("source", "group", "channel", "result"))
+BYTES = REGISTRY.counter(
+    "zerohook_bytes_total", "Media bytes transferred", ("source", "direction"))
+DOWNLOAD_SECONDS = REGISTRY.histogram(
+    "zerohook_download_seconds", "Time to download one media file", ("source",))
+UPLOAD_SECONDS = REGISTRY.histogram(
+    "zerohook_upload_seconds", "Time to upload the media of one post", ("source",))
+SEND_SECONDS = REGISTRY.histogram(
+    "zerohook_send_seconds", "Time to send one message to one chat", ("source",))
+FLOOD_WAITS = REGISTRY.counter(
+    "zerohook_flood_waits_total", "FloodWait errors from Telegram", ("source",))
+FLOOD_WAIT_SECONDS = REGISTRY.histogram(
+    "zerohook_flood_wait_seconds", "Waits demanded by FloodWait errors", ("source",),
+    buckets=(1, 5, 10, 30, 60, 300, 900, 3600, 86400))
+QUEUE_DEPTH = REGISTRY.gauge(
+    "zerohook_queue_depth", "Items waiting in internal queues", ("queue",))
+SCHEDULER_LAG_SECONDS = REGISTRY.histogram(
+    "zerohook_scheduler_lag_seconds", "Delay between a post coming due and the scheduler starting it", ())
+STORAGE_SECONDS = REGISTRY.histogram(
+    "zerohook_storage_operation_seconds", "Time of one storage operation", ("backend", "operation"))
@@ -0,0 +1,429 @@
+"""Storage backends for the web_auth config, content groups and their content.
+
+Every backend implements the same operations:
+    read_config() / write_config(config)
+    read_groups() / write_groups(groups)
+    store_group(group, group_ids) / delete_group(group_id, group_ids) / update_group(group_id, ops, group)
+    read_content(group_id, position=None) / append_content(group_id, item, position)
+    remove_content(group_id, content_id) / delete_content(group_id)
+    dump() / replace_all(data)  # whole store as {'config', 'groups', 'content'}, used to migrate
+
+Read errors propagate, a store never answers a failed read with empty data.
+Importing this module has no side effects, so tools like migrate_storage can
+use the stores without starting the web app.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+SQLITE_FILE = 'zerohook.db'
+MONGO_DATABASE = 'zerohookbot'
+
+
+def write_json_atomic(path, data):
+    """Write JSON to a temp file and rename it over path, so readers never see a partial file"""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class JsonStore:
+    """One JSON file for the config and for each group and its content"""
+
+    name = 'json'
+
+    def __init__(self, resource_path):
+        self.config_path = os.path.join(resource_path, 'autopostConfig.json')
+        self.legacy_groups_path = os.path.join(resource_path, 'content_groups.json')  # migrated to groups_dir
+        self.groups_dir = os.path.join(resource_path, 'groups')
+        self.index_path = os.path.join(self.groups_dir, 'index.json')
+        self.content_dir = os.path.join(self.groups_dir, 'content')
+
+    def _group_file(self, group_id):
+        return os.path.join(self.groups_dir, f"{group_id}.json")
+
+    def _content_file(self, group_id):
+        return os.path.join(self.content_dir, f"{group_id}.json")
+
+    def _write_group_index(self, group_ids):
+        write_json_atomic(self.index_path, list(group_ids))
+
+    def _migrate_groups_file(self):
+        """Split the legacy content_groups.json into one file per group"""
+        os.makedirs(self.groups_dir, exist_ok=True)
+        if os.path.exists(self.index_path) or not os.path.exists(self.legacy_groups_path):
+            return
+        try:
+            with open(self.legacy_groups_path, 'r') as f:
+                groups = json.load(f)
+        except Exception as e:
+            logger.error(f"Groups migration error: {e}")
+            return
+        for g in groups:
+            write_json_atomic(self._group_file(g['id']), g)
+        self._write_group_index([g['id'] for g in groups])
+        os.replace(self.legacy_groups_path, self.legacy_groups_path + '.migrated')
+        logger.info(f"📁 Migrated {len(groups)} groups to {self.groups_dir}")
+
+    def read_config(self):
+        try:
+            with open(self.config_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def write_config(self, config):
+        write_json_atomic(self.config_path, config)
+
+    def read_groups(self):
+        self._migrate_groups_file()
+        try:
+            with open(self.index_path, 'r') as f:
+                group_ids = json.load(f)
+        except FileNotFoundError:
+            return []
+        groups = []
+        for gid in group_ids:
+            try:
+                with open(self._group_file(gid), 'r') as f:
+                    groups.append(json.load(f))
+            except FileNotFoundError:
+                # Deleted after the index was read
+                continue
+        return groups
+
+    def write_groups(self, groups):
+        group_ids = [g['id'] for g in groups]
+        os.makedirs(self.groups_dir, exist_ok=True)
+        for g in groups:
+            write_json_atomic(self._group_file(g['id']), g)
+        self._write_group_index(group_ids)
+        for name in os.listdir(self.groups_dir):
+            if name.endswith('.json') and name != 'index.json' and name[:-5] not in group_ids:
+                os.remove(os.path.join(self.groups_dir, name))
+                self.delete_content(name[:-5])
+
+    def store_group(self, group, group_ids):
+        os.makedirs(self.groups_dir, exist_ok=True)
+        write_json_atomic(self._group_file(group['id']), group)
+        self._write_group_index(group_ids)
+
+    def delete_group(self, group_id, group_ids):
+        self._write_group_index(group_ids)
+        try:
+            os.remove(self._group_file(group_id))
+        except OSError:
+            pass
+
+    def update_group(self, group_id, ops, group):
+        # Only this group's file is rewritten, with the already updated group
+        os.makedirs(self.groups_dir, exist_ok=True)
+        write_json_atomic(self._group_file(group_id), group)
+
+    def _read_content_file(self, group_id):
+        try:
+            with open(self._content_file(group_id), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def read_content(self, group_id, position=None):
+        items = self._read_content_file(group_id)
+        if position is None:
+            return items
+        return items[position] if 0 <= position < len(items) else None
+
+    def append_content(self, group_id, item, position):
+        os.makedirs(self.content_dir, exist_ok=True)
+        write_json_atomic(self._content_file(group_id), self._read_content_file(group_id) + [item])
+
+    def remove_content(self, group_id, content_id):
+        items = self._read_content_file(group_id)
+        remaining = [c for c in items if c['id'] != content_id]
+        if len(remaining) == len(items):
+            return False
+        write_json_atomic(self._content_file(group_id), remaining)
+        return True
+
+    def delete_content(self, group_id):
+        try:
+            os.remove(self._content_file(group_id))
+        except OSError:
+            pass
+
+    def dump(self):
+        groups = self.read_groups()
+        return {
+            'config': self.read_config(),
+            'groups': groups,
+            'content': {g['id']: self.read_content(g['id']) for g in groups}
+        }
+
+    def replace_all(self, data):
+        if data['config'] is not None:
+            self.write_config(data['config'])
+        self.write_groups(data['groups'])
+        os.makedirs(self.content_dir, exist_ok=True)
+        for g in data['groups']:
+            write_json_atomic(self._content_file(g['id']), data['content'].get(g['id'], []))
+
+
+class SqliteStore:
+    """SQLite database in WAL mode.
+
+    Readers never block the writer and each write is one short transaction
+    touching only the rows involved. Connections are per thread, since the
+    scheduler, bot and Flask threads all use the store.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS config (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS groups (id TEXT PRIMARY KEY, position INTEGER NOT NULL, data TEXT NOT NULL);
+        CREATE TABLE IF NOT EXISTS group_content (
+            group_id TEXT NOT NULL, id TEXT NOT NULL, position INTEGER NOT NULL, data TEXT NOT NULL,
+            PRIMARY KEY (group_id, id)
+        );
+        CREATE INDEX IF NOT EXISTS group_content_position ON group_content (group_id, position);
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript(self.SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def read_config(self):
+        row = self._conn().execute("SELECT value FROM config WHERE key = 'main'").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def write_config(self, config):
+        with self._conn() as conn:
+            conn.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('main', ?)", (json.dumps(config),))
+
+    def read_groups(self):
+        rows = self._conn().execute("SELECT data FROM groups ORDER BY position").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _reorder(self, conn, group_ids):
+        conn.executemany("UPDATE groups SET position = ? WHERE id = ?", [(i, gid) for i, gid in enumerate(group_ids)])
+
+    def write_groups(self, groups):
+        group_ids = [g['id'] for g in groups]
+        marks = ','.join('?' * len(group_ids))
+        with self._conn() as conn:
+            conn.execute(f"DELETE FROM groups WHERE id NOT IN ({marks})", group_ids)
+            conn.execute(f"DELETE FROM group_content WHERE group_id NOT IN ({marks})", group_ids)
+            conn.executemany(
+                "INSERT OR REPLACE INTO groups (id, position, data) VALUES (?, ?, ?)",
+                [(g['id'], i, json.dumps(g)) for i, g in enumerate(groups)]
+            )
+
+    def store_group(self, group, group_ids):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO groups (id, position, data) VALUES (?, ?, ?)",
+                (group['id'], len(group_ids), json.dumps(group))
+            )
+            self._reorder(conn, group_ids)
+
+    def delete_group(self, group_id, group_ids):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM groups WHERE id = ?", (group_id,))
+
+    def update_group(self, group_id, ops, group):
+        with self._conn() as conn:
+            conn.execute("UPDATE groups SET data = ? WHERE id = ?", (json.dumps(group), group_id))
+
+    def read_content(self, group_id, position=None):
+        conn = self._conn()
+        if position is None:
+            rows = conn.execute(
+                "SELECT data FROM group_content WHERE group_id = ? ORDER BY position", (group_id,)
+            ).fetchall()
+            return [json.loads(row[0]) for row in rows]
+        row = conn.execute(
+            "SELECT data FROM group_content WHERE group_id = ? AND position = ?", (group_id, position)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def append_content(self, group_id, item, position):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO group_content (group_id, id, position, data) VALUES (?, ?, ?, ?)",
+                (group_id, item['id'], position, json.dumps(item))
+            )
+
+    def remove_content(self, group_id, content_id):
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT position FROM group_content WHERE group_id = ? AND id = ?", (group_id, content_id)
+            ).fetchone()
+            if row is None:
+                return False
+            conn.execute("DELETE FROM group_content WHERE group_id = ? AND id = ?", (group_id, content_id))
+            conn.execute(
+                "UPDATE group_content SET position = position - 1 WHERE group_id = ? AND position > ?",
+                (group_id, row[0])
+            )
+        return True
+
+    def delete_content(self, group_id):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM group_content WHERE group_id = ?", (group_id,))
+
+    def dump(self):
+        groups = self.read_groups()
+        return {
+            'config': self.read_config(),
+            'groups': groups,
+            'content': {g['id']: self.read_content(g['id']) for g in groups}
+        }
+
+    def replace_all(self, data):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM groups")
+            conn.execute("DELETE FROM group_content")
+            if data['config'] is not None:
+                conn.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('main', ?)", (json.dumps(data['config']),))
+            conn.executemany(
+                "INSERT INTO groups (id, position, data) VALUES (?, ?, ?)",
+                [(g['id'], i, json.dumps(g)) for i, g in enumerate(data['groups'])]
+            )
+            conn.executemany(
+                "INSERT INTO group_content (group_id, id, position, data) VALUES (?, ?, ?, ?)",
+                [(gid, item['id'], position, json.dumps(item))
+                 for gid, items in data['content'].items() for position, item in enumerate(items)]
+            )
+
+
+class MongoStore:
+    """Collections config, content_groups and group_content of a MongoDB database"""
+
+    name = 'mongo'
+
+    def __init__(self, db):
+        self.db = db
+
+    def read_config(self):
+        doc = self.db.config.find_one({'key': 'main'})
+        return doc['value'] if doc and 'value' in doc else None
+
+    def write_config(self, config):
+        self.db.config.update_one(
+            {'key': 'main'},
+            {'$set': {'key': 'main', 'value': config}},
+            upsert=True
+        )
+
+    def read_groups(self):
+        docs = list(self.db.content_groups.find({}, {'_id': 0}))
+        return [doc['data'] for doc in docs if 'data' in doc]
+
+    def write_groups(self, groups):
+        from pymongo import DeleteMany, ReplaceOne
+        group_ids = [g['id'] for g in groups]
+        operations = [ReplaceOne({'id': g['id']}, {'id': g['id'], 'data': g}, upsert=True) for g in groups]
+        operations.append(DeleteMany({'id': {'$nin': group_ids}}))
+        self.db.content_groups.bulk_write(operations, ordered=False)
+        self.db.group_content.delete_many({'group_id': {'$nin': group_ids}})
+
+    def store_group(self, group, group_ids):
+        self.db.content_groups.replace_one({'id': group['id']}, {'id': group['id'], 'data': group}, upsert=True)
+
+    def delete_group(self, group_id, group_ids):
+        self.db.content_groups.delete_one({'id': group_id})
+
+    def update_group(self, group_id, ops, group):
+        # The operations themselves, so concurrent updates from elsewhere are not overwritten
+        update = {op: {f'data.{key}': value for key, value in fields.items()} for op, fields in ops.items() if fields}
+        self.db.content_groups.update_one({'id': group_id}, update)
+
+    def read_content(self, group_id, position=None):
+        if position is None:
+            docs = self.db.group_content.find({'group_id': group_id}, {'_id': 0, 'data': 1}).sort('position', 1)
+            return [doc['data'] for doc in docs]
+        doc = self.db.group_content.find_one({'group_id': group_id, 'position': position}, {'_id': 0, 'data': 1})
+        return doc['data'] if doc else None
+
+    def append_content(self, group_id, item, position):
+        self.db.group_content.insert_one({'group_id': group_id, 'position': position, 'id': item['id'], 'data': item})
+
+    def remove_content(self, group_id, content_id):
+        doc = self.db.group_content.find_one_and_delete({'group_id': group_id, 'id': content_id})
+        if doc is None:
+            return False
+        self.db.group_content.update_many(
+            {'group_id': group_id, 'position': {'$gt': doc['position']}},
+            {'$inc': {'position': -1}}
+        )
+        return True
+
+    def delete_content(self, group_id):
+        self.db.group_content.delete_many({'group_id': group_id})
+
+    def dump(self):
+        content = {}
+        for doc in self.db.group_content.find({}, {'_id': 0, 'group_id': 1, 'data': 1}).sort([('group_id', 1), ('position', 1)]):
+            content.setdefault(doc['group_id'], []).append(doc['data'])
+        return {'config': self.read_config(), 'groups': self.read_groups(), 'content': content}
+
+    def replace_all(self, data):
+        if data['config'] is not None:
+            self.write_config(data['config'])
+        self.write_groups(data['groups'])
+        self.db.group_content.delete_many({})
+        documents = [
+            {'group_id': gid, 'position': position, 'id': item['id'], 'data': item}
+            for gid, items in data['content'].items() for position, item in enumerate(items)
+        ]
+        if documents:
+            self.db.group_content.insert_many(documents)
+
+
+def open_store(backend, resource_path, mongo_uri=None):
+    """Store for a STORAGE_BACKEND name.
+
+    Args:
+        backend: "json", "sqlite" or "mongo"
+        resource_path: Directory holding the JSON files and the SQLite database
+        mongo_uri: MongoDB connection string, the server must be reachable
+
+    Returns:
+        The opened store
+    """
+    if backend == 'sqlite':
+        return SqliteStore(os.path.join(resource_path, SQLITE_FILE))
+    if backend == 'json':
+        return JsonStore(resource_path)
+    if backend == 'mongo':
+        if not mongo_uri:
+            raise ValueError("MONGO_URI is not set")
+        from pymongo import MongoClient
+        client = MongoClient(mongo_uri, tls=True, tlsAllowInvalidCertificates=True, serverSelectionTimeoutMS=5000)
+        client.admin.command('ping')
+        return MongoStore(client[MONGO_DATABASE])
+    raise ValueError(f"Unknown storage backend: {backend}")
@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+
+from source.model.AutoPostQueue import AutoPostQueue
+
+
+class AutoPostQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.db_path = os.path.join(self.tmp.name, 'queue.db')
+        self.legacy_path = os.path.join(self.tmp.name, 'schedule.json')
+
+    def open(self, legacy=False):
+        queue = AutoPostQueue(self.db_path, legacy_path=self.legacy_path if legacy else None)
+        self.addCleanup(queue.close)
+        return queue
+
+    def test_migrates_legacy_queue_once(self):
+        legacy = {'_default': {
+            '2': {'photo_path': 'b.jpg', 'caption': 'b', 'scheduled_for': '2026-10-21', 'posted': 0},
+            '10': {'photo_path': 'c.jpg', 'caption': 'c', 'scheduled_for': '2026-10-22', 'posted': 1},
+            '1': {'photo_path': 'a.jpg', 'caption': 'a', 'scheduled_for': '2026-10-20', 'posted': 0},
+        }}
+        with open(self.legacy_path, 'w') as file:
+            json.dump(legacy, file)
+        queue = self.open(legacy=True)
+        self.assertEqual([post['caption'] for post in queue.pending()], ['a', 'b'])
+        self.assertEqual((queue.count_pending(), queue.count_posted(), queue.count()), (2, 1, 3))
+        self.assertFalse(os.path.exists(self.legacy_path))
+        self.assertTrue(os.path.exists(self.legacy_path + '.migrated'))
+        
+        # Reopening neither imports again nor loses the counts
+        queue.close()
+        with open(self.legacy_path, 'w') as file:
+            json.dump(legacy, file)
+        reopened = self.open(legacy=True)
+        self.assertEqual(reopened.count(), 3)
+        self.assertTrue(os.path.exists(self.legacy_path))
+
+    def test_counts_follow_updates(self):
+        queue = self.open()
+        first = queue.insert({'photo_path': 'a.jpg', 'scheduled_for': '2026-10-20'})
+        queue.insert({'photo_path': 'b.jpg', 'scheduled_for': '2026-10-21'})
+        queue.mark_posted(first['id'])
+        queue.mark_posted(first['id'])
+        self.assertEqual((queue.count_pending(), queue.count_posted()), (1, 1))
+        queue.update(first['id'], {'posted': 0})
+        self.assertEqual((queue.count_pending(), queue.count_posted()), (2, 0))
+        queue.mark_posted(first['id'])
+        self.assertEqual(queue.clear_posted(), 1)
+        self.assertEqual((queue.count_pending(), queue.count_posted(), queue.count()), (1, 0, 1))
+        self.assertEqual(self.open().count(), 1)
+
+    def test_next_due_and_results(self):
+        queue = self.open()
+        late = queue.insert({'photo_path': 'b.jpg', 'scheduled_for': '2026-10-21T13:00:00'})
+        early = queue.insert({'photo_path': 'a.jpg', 'scheduled_for': '2026-10-20T13:00:00'})
+        self.assertIsNone(queue.next_due('2026-10-20T12:59:59'))
+        self.assertEqual(queue.next_due('2026-10-21T00:00:00')['id'], early['id'])
+        self.assertEqual(queue.first_pending()['id'], early['id'])
+        self.assertEqual(queue.last_scheduled(), late['scheduled_for'])
+        
+        queue.record_result(early['id'], -100, 'failed', error='flood')
+        queue.record_result(early['id'], -100, 'sent', message_id=5)
+        queue.record_result(early['id'], -200, 'failed', error='forbidden')
+        results = queue.get_results(early['id'])
+        self.assertEqual([(r['channel_id'], r['status']) for r in results], [(-200, 'failed'), (-100, 'sent')])
+        self.assertEqual(queue.count_failed(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import tempfile
+import unittest
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest import mock
+
+from source.service import AutoPostReceiver as module
+from source.service.AutoPostReceiver import AutoPostReceiver
+
+
+class PostNowTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(module, "AUTOPOST_MEDIA_PATH", tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.future = Future()
+        self.service = mock.Mock()
+        self.service.do_post = mock.Mock(return_value=None)
+        self.service.run_threadsafe = mock.Mock(return_value=self.future)
+        self.receiver = AutoPostReceiver("1:token", "owner", self.service, SimpleNamespace())
+        self.receiver.bot.reply_to = mock.Mock()
+        self.message = SimpleNamespace(from_user=SimpleNamespace(username="owner"))
+
+    def post_now(self):
+        handler = next(
+            h for h in self.receiver.bot.message_handlers
+            if "postnow" in (h["filters"].get("commands") or [])
+        )
+        handler["function"](self.message)
+
+    def replies(self):
+        return [call.args[1] for call in self.receiver.bot.reply_to.call_args_list]
+
+    def test_handler_returns_before_post_finishes(self):
+        self.post_now()
+        self.assertEqual(self.replies(), [])
+
+        self.future.set_result(True)
+        self.assertEqual(self.replies(), ["✅ Posted next queued photo"])
+
+    def test_nothing_posted(self):
+        self.post_now()
+        self.future.set_result(False)
+        self.assertEqual(self.replies(), ["❌ Nothing was posted"])
+
+    def test_post_error_is_reported(self):
+        self.post_now()
+        self.future.set_exception(RuntimeError("boom"))
+        self.assertEqual(self.replies(), ["❌ Error: boom"])
+
+
+if __name__ == "__main__":
+    unittest.main()
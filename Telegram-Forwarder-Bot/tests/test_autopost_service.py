@@ -0,0 +1,126 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from telethon.errors import FilePartMissingError, FloodWaitError
+
+from source.model.AutoPostQueue import AutoPostQueue
+from source.service import AutoPostService as module
+from source.service.AutoPostService import AutoPostService
+
+
+class FakeClient:
+    """Telethon client stand-in answering send_file from a list of outcomes."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.sent = []
+        self.loop = None
+
+    async def get_input_entity(self, channel_id):
+        return channel_id
+
+    async def send_file(self, channel, file, caption=""):
+        self.sent.append(file)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class AutoPostServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        db_path = os.path.join(self.tmp.name, "queue.db")
+        patcher = mock.patch.object(module, "AutoPostQueue", lambda: AutoPostQueue(db_path, legacy_path=None))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def service(self, outcomes=(), **config):
+        service = AutoPostService(FakeClient(outcomes), {"channel_id": -100, "optimize_images": False, **config})
+        self.addCleanup(service.queue.close)
+        return service
+
+    def send(self, service, fallback="photo.jpg"):
+        post = service.queue.insert({"photo_path": "photo.jpg", "scheduled_for": "2026-10-19"})
+        message = asyncio.run(service._send_to_channel(post["id"], -100, "handle", "", fallback=fallback))
+        return message, service.queue.get_results(post["id"])
+
+    def test_sent(self):
+        service = self.service([SimpleNamespace(id=7)])
+        message, results = self.send(service)
+        self.assertEqual(message.id, 7)
+        self.assertEqual(results[0]["status"], "sent")
+        self.assertEqual(service.client.sent, ["handle"])
+
+    def test_rejected_media_falls_back(self):
+        service = self.service([FilePartMissingError(request=None, capture=0), SimpleNamespace(id=8)])
+        message, results = self.send(service)
+        self.assertEqual(message.id, 8)
+        self.assertEqual(service.client.sent, ["handle", "photo.jpg"])
+
+    def test_long_flood_wait_does_not_fall_back(self):
+        service = self.service([FloodWaitError(request=None, capture=3600)])
+        message, results = self.send(service)
+        self.assertIsNone(message)
+        self.assertEqual(results[0]["status"], "failed")
+        self.assertEqual(service.client.sent, ["handle"])
+
+    def test_other_error_does_not_fall_back(self):
+        service = self.service([RuntimeError("chat write forbidden")])
+        message, results = self.send(service)
+        self.assertIsNone(message)
+        self.assertEqual(service.client.sent, ["handle"])
+
+    def test_reused_media_falls_back_for_remaining_channels(self):
+        service = self.service([
+            SimpleNamespace(id=1, media="sent-media"),
+            FilePartMissingError(request=None, capture=0),
+            SimpleNamespace(id=2, media="sent-media"),
+        ])
+        post = service.queue.insert({"photo_path": "photo.jpg", "scheduled_for": "2026-10-19"})
+        results = asyncio.run(service._publish(post["id"], [-100, -200], ["handle"], ["photo.jpg"], ""))
+        self.assertEqual(results, {-100: True, -200: True})
+        self.assertEqual(service.client.sent, ["handle", "sent-media", "photo.jpg"])
+
+    def test_stale_and_finished_uploads_are_evicted(self):
+        service = self.service()
+        pending = service.queue.insert({"photo_path": "a.jpg", "scheduled_for": "2026-10-19"})
+        posted = service.queue.insert({"photo_path": "b.jpg", "scheduled_for": "2026-10-19"})
+        stale = service.queue.insert({"photo_path": "c.jpg", "scheduled_for": "2026-10-19"})
+        service.queue.mark_posted(posted["id"])
+        now = datetime.now()
+        service._uploads = {
+            pending["id"]: (["a"], now),
+            posted["id"]: (["b"], now),
+            stale["id"]: (["c"], now - service.UPLOAD_MAX_AGE - timedelta(seconds=1)),
+            999: (["gone"], now),
+        }
+        service._evict_uploads()
+        self.assertEqual(list(service._uploads), [pending["id"]])
+        self.assertEqual(service._take_upload(pending["id"]), ["a"])
+        self.assertEqual(service._uploads, {})
+
+    def test_scheduler_survives_unreachable_schedule(self):
+        service = self.service(posting_cron="0 0 31 2 *")
+        service.queue.insert({"photo_path": "a.jpg", "scheduled_for": "2026-10-19"})
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+            service.running = False
+            return False
+
+        service._sleep = sleep
+        service.running = True
+        asyncio.run(service._scheduler_loop())
+        self.assertEqual(delays, [module.SCHEDULER_RETRY_SECONDS])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from tests.test_scheduler import SchedulerCase, make_group, web_auth
+
+
+class RestartTest(SchedulerCase):
+    def test_due_time(self):
+        now = datetime.now()
+        self.assertAlmostEqual(web_auth.group_due_time(make_group('a')), time.time(), delta=1)
+        last = make_group('a', last_post_at=now.isoformat())
+        self.assertAlmostEqual(web_auth.group_due_time(last), now.timestamp() + 600, delta=1)
+        due = make_group('a', last_post_at=now.isoformat(), next_due_at=(now + timedelta(minutes=1)).isoformat())
+        self.assertAlmostEqual(web_auth.group_due_time(due), now.timestamp() + 60, delta=1)
+
+    def test_reschedule_all_catch_up(self):
+        now = datetime.now()
+        self.add(make_group('late', last_post_at=(now - timedelta(hours=1)).isoformat()))
+        self.add(make_group('later', last_post_at=(now - timedelta(hours=2)).isoformat()))
+        self.add(make_group('future', next_due_at=(now + timedelta(minutes=5)).isoformat()))
+        self.add(make_group('off', enabled=False))
+        with mock.patch.object(web_auth, 'SCHEDULER_CATCHUP', 'spread'), \
+                mock.patch.object(web_auth, 'SCHEDULER_SPREAD_SECONDS', 100):
+            web_auth.reschedule_all(catch_up=True)
+        due = {gid: due - time.time() for due, gid in self.live_entries()}
+        self.assertEqual(set(due), {'late', 'later', 'future'})
+        # Most overdue first, the others spread over the window
+        self.assertAlmostEqual(due['later'], 0, delta=2)
+        self.assertAlmostEqual(due['late'], 50, delta=2)
+        self.assertAlmostEqual(due['future'], 300, delta=2)
+
+
+class CatchUpTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(web_auth, 'SCHEDULER_JITTER_SECONDS', 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now = time.time()
+        self.overdue = make_group('a', last_post_at='2026-01-01T00:00:00')
+
+    def due(self, policy, entries):
+        with mock.patch.object(web_auth, 'SCHEDULER_CATCHUP', policy):
+            return {gid: due - self.now for due, gid in web_auth.catch_up_times(entries)}
+
+    def test_skip_moves_to_next_slot(self):
+        due = self.due('skip', [(self.now - 1500, self.overdue)])['a']
+        self.assertAlmostEqual(due, 300, delta=2)
+
+    def test_skip_posts_groups_that_never_posted(self):
+        self.assertAlmostEqual(self.due('skip', [(self.now - 5, make_group('b'))])['b'], 0, delta=2)
+
+    def test_once(self):
+        self.assertAlmostEqual(self.due('once', [(self.now - 1500, self.overdue)])['a'], 0, delta=2)
+
+    def test_not_overdue_is_kept(self):
+        self.assertAlmostEqual(self.due('once', [(self.now + 60, self.overdue)])['a'], 60, delta=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
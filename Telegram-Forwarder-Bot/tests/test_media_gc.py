@@ -0,0 +1,130 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+os.environ.setdefault('STORAGE_BACKEND', 'json')
+
+import web_auth
+from source.utils.MediaStore import MediaStore
+
+
+class MediaGcTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = MediaStore(os.path.join(self.tmp.name, 'store'), grace_seconds=60)
+        self.groups = []
+        self.content = {}
+        self.pending = web_auth.PendingStore(ttl=600, max_items=10)
+        patches = [
+            mock.patch.object(web_auth, 'media_store', self.store),
+            mock.patch.object(web_auth, 'pending_content', self.pending),
+            mock.patch.object(web_auth, 'load_groups', lambda: [dict(g) for g in self.groups]),
+            mock.patch.object(web_auth.repo, 'get_content', lambda gid: list(self.content.get(gid, []))),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def incoming(self, data):
+        path = os.path.join(self.tmp.name, self.store.incoming_name() + '.jpg')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def media(self, data):
+        """Add a file to the store, old enough to be collected"""
+        path = self.store.add(self.incoming(data))
+        os.utime(path, (time.time() - 3600, time.time() - 3600))
+        return path
+
+    def add_group(self, gid, items):
+        self.groups.append({'id': gid, 'name': gid, 'content_count': len(items)})
+        self.content[gid] = items
+
+    def test_refs(self):
+        a, b, c = self.media(b'a'), self.media(b'b'), self.media(b'c')
+        self.add_group('g1', [{'id': '1', 'file_path': a}, {'id': '2', 'file_paths': [a, b]}, {'id': '3', 'text_content': 'hi'}])
+        self.pending.put(1, 10, {'type': 'file', 'file_path': c})
+        refs, users, complete = web_auth.media_refs()
+        self.assertTrue(complete)
+        self.assertEqual(refs, {a: 2, b: 1, c: 1})
+        self.assertEqual([item['id'] for _, item in users[a]], ['1', '2'])
+        self.assertNotIn(c, users)
+
+    def test_collects_unreferenced(self):
+        used, unused = self.media(b'used'), self.media(b'unused')
+        self.add_group('g1', [{'id': '1', 'file_path': used}])
+        web_auth.collect_media()
+        self.assertTrue(os.path.exists(used))
+        self.assertFalse(os.path.exists(unused))
+
+    def test_read_error_deletes_nothing(self):
+        path = self.media(b'x')
+        self.add_group('g1', [{'id': '1', 'file_path': path}])
+        with mock.patch.object(web_auth.repo, 'get_content', side_effect=OSError('storage down')):
+            with self.assertRaises(OSError):
+                web_auth.collect_media()
+        self.assertTrue(os.path.exists(path))
+
+    def test_short_content_read_skips_pass(self):
+        kept, unused = self.media(b'kept'), self.media(b'unused')
+        self.add_group('g1', [{'id': '1', 'file_path': kept}])
+        self.groups[0]['content_count'] = 2
+        web_auth.collect_media()
+        self.assertTrue(os.path.exists(unused))
+
+    def test_no_refs_with_stored_media_skips_pass(self):
+        path = self.media(b'x')
+        web_auth.collect_media()
+        self.assertTrue(os.path.exists(path))
+
+    def test_quota_evicts_oldest_and_keeps_fresh_files(self):
+        self.store.quota_bytes = 20
+        oldest, older = self.media(b'o' * 8), self.media(b'p' * 8)
+        os.utime(oldest, (time.time() - 7200, time.time() - 7200))
+        fresh = self.store.add(self.incoming(b'f' * 8))
+        self.add_group('g1', [{'id': '1', 'file_path': oldest}, {'id': '2', 'file_path': older},
+                              {'id': '3', 'file_path': fresh}])
+        with mock.patch.object(web_auth, 'remove_content_from_group') as remove:
+            web_auth.collect_media()
+        remove.assert_called_once_with('g1', '1')
+        self.assertFalse(os.path.exists(oldest))
+        self.assertTrue(os.path.exists(older))
+        self.assertTrue(os.path.exists(fresh))
+
+
+class MediaStoreQuotaTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.store = MediaStore(os.path.join(tmp.name, 'store'), quota_bytes=10, grace_seconds=60)
+
+    def add(self, data, age):
+        path = os.path.join(self.tmp, self.store.incoming_name())
+        with open(path, 'wb') as f:
+            f.write(data)
+        path = self.store.add(path)
+        os.utime(path, (time.time() - age, time.time() - age))
+        return path
+
+    def test_unreferenced_first(self):
+        used = self.add(b'u' * 8, age=7200)
+        spare = self.add(b's' * 8, age=3600)
+        self.assertEqual(self.store.over_quota({used: 1}), [(spare, 8)])
+
+    def test_fresh_files_are_not_evicted(self):
+        fresh = self.add(b'f' * 8, age=0)
+        old = self.add(b'o' * 8, age=3600)
+        self.assertEqual(self.store.over_quota({fresh: 1, old: 1}), [(old, 8)])
+        self.assertEqual(self.store.over_quota({}), [(old, 8)])
+        os.remove(old)
+        self.add(b'g' * 8, age=0)
+        self.assertEqual(self.store.over_quota({}), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+from source.service.MediaOptimizer import optimize_image
+
+
+class OptimizeImageTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output_dir = os.path.join(self.tmp.name, "optimized")
+
+    def save(self, image, name, **params):
+        path = os.path.join(self.tmp.name, name)
+        image.save(path, **params)
+        return path
+
+    def test_transparency_goes_on_white(self):
+        # Noise on the left half keeps the PNG larger than the JPEG, the right half is transparent
+        image = Image.frombytes("RGB", (256, 256), os.urandom(256 * 256 * 3)).convert("RGBA")
+        image.paste((0, 0, 0, 0), (128, 0, 256, 256))
+        result = optimize_image(self.save(image, "photo.png"), self.output_dir)
+        self.assertIsNotNone(result["optimized_path"])
+        with Image.open(result["optimized_path"]) as optimized:
+            self.assertEqual(optimized.mode, "RGB")
+            self.assertGreater(min(optimized.getpixel((250, 128))), 245)
+
+    def test_larger_result_is_not_used(self):
+        path = self.save(Image.new("RGB", (64, 64), (10, 20, 30)), "flat.png")
+        result = optimize_image(path, self.output_dir)
+        self.assertIsNone(result["optimized_path"])
+        self.assertGreaterEqual(result["optimized_bytes"], result["original_bytes"])
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
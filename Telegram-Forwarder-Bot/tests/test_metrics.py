@@ -0,0 +1,65 @@
+import asyncio
+import os
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+os.environ.setdefault('STORAGE_BACKEND', 'json')
+
+import web_auth
+from source.service.MessageForwardService import MessageForwardService
+from source.utils.Metrics import MESSAGES_FORWARDED, Registry, _Metric
+
+
+class MetricsRouteTest(unittest.TestCase):
+    def setUp(self):
+        self.client = web_auth.app.test_client()
+
+    def test_disabled_without_token(self):
+        with mock.patch.object(web_auth, 'METRICS_TOKEN', ''):
+            self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    def test_needs_token(self):
+        with mock.patch.object(web_auth, 'METRICS_TOKEN', 'secret'):
+            self.assertEqual(self.client.get('/metrics').status_code, 401)
+            response = self.client.get('/metrics', headers={'Authorization': 'Bearer wrong'})
+            self.assertEqual(response.status_code, 401)
+            response = self.client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b'# TYPE zerohook_posts_total counter', response.data)
+
+
+class RegistryTest(unittest.TestCase):
+    def test_exposition(self):
+        registry = Registry()
+        posts = registry.counter('posts_total', 'Posts', ('group',))
+        posts.inc(group='a "b"')
+        registry.gauge('depth', 'Depth').set_function(lambda: 3)
+        latency = registry.histogram('latency_seconds', 'Latency', buckets=(1, 5))
+        latency.observe(2)
+        text = registry.exposition()
+        self.assertIn('posts_total{group="a \\"b\\""} 1', text)
+        self.assertIn('depth 3', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 0', text)
+        self.assertIn('latency_seconds_bucket{le="5"} 1', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 1', text)
+        with self.assertRaises(ValueError):
+            posts.inc(channel='x')
+
+    def test_metric_base_is_abstract(self):
+        with self.assertRaises(TypeError):
+            _Metric('base', 'Base')
+
+
+class ForwardMetricsTest(unittest.TestCase):
+    def test_forwarded_messages_carry_the_route(self):
+        client = mock.Mock()
+        client.forward_messages = mock.AsyncMock(return_value='sent')
+        message = SimpleNamespace(forward=object(), media=None, chat_id=-1005)
+        asyncio.run(MessageForwardService(client).forward_message(-1009, message))
+        sample = 'zerohook_messages_forwarded_total{source_chat="-1005",destination="-1009",kind="forward",result="ok"}'
+        self.assertTrue(any(line.startswith(sample) for line in MESSAGES_FORWARDED.samples()))
+
+
+if __name__ == '__main__':
+    unittest.main()
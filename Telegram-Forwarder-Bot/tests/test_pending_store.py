@@ -0,0 +1,36 @@
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault('STORAGE_BACKEND', 'json')
+
+import web_auth
+
+
+class PendingStoreTest(unittest.TestCase):
+    def test_ttl(self):
+        store = web_auth.PendingStore(ttl=60, max_items=10)
+        with mock.patch.object(web_auth.time, 'time', return_value=1000):
+            store.put(1, 10, {'id': 'a'})
+        with mock.patch.object(web_auth.time, 'time', return_value=1059):
+            self.assertEqual(store.get(1, 10), {'id': 'a'})
+        with mock.patch.object(web_auth.time, 'time', return_value=1060), \
+                mock.patch.object(web_auth, 'media_gc_wake') as wake:
+            self.assertIsNone(store.get(1, 10))
+            self.assertEqual(store.values(), [])
+        wake.set.assert_called_once()
+
+    def test_latest_and_max_items(self):
+        store = web_auth.PendingStore(ttl=60, max_items=2)
+        store.put(1, 10, {'id': 'a'})
+        store.put(1, 11, {'id': 'b'})
+        store.put(2, 12, {'id': 'c'})
+        self.assertIsNone(store.get(1, 10))
+        self.assertEqual(store.get(1), {'id': 'b'})
+        self.assertEqual(store.pop(1), {'id': 'b'})
+        self.assertIsNone(store.get(1))
+        self.assertEqual(store.values(), [{'id': 'c'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+os.environ.setdefault('STORAGE_BACKEND', 'json')
+
+from telethon.errors import ChatWriteForbiddenError, FilePartMissingError
+
+import web_auth
+
+
+class FakeClient:
+    """Telethon client stand-in answering send_file from a list of outcomes."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.sent = []
+
+    async def upload_file(self, path):
+        return 'handle'
+
+    async def send_file(self, peer, file, caption=''):
+        self.sent.append((peer, file))
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+class PostToChannelsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.session = os.path.join(tmp.name, 'account')
+        open(self.session + '.session', 'w').close()
+        self.photo = os.path.join(tmp.name, 'photo.jpg')
+        with open(self.photo, 'wb') as f:
+            f.write(b'jpeg')
+        self.pool = mock.Mock()
+        self.pool.peer = mock.AsyncMock(side_effect=lambda session, channel: channel)
+        self.pool.drop = mock.AsyncMock()
+        patches = [
+            mock.patch.object(web_auth, 'client_pool', self.pool),
+            mock.patch.object(web_auth, 'send_slots', None),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def post(self, outcomes, channels):
+        client = FakeClient(outcomes)
+        self.pool.get = mock.AsyncMock(return_value=client)
+        item = {'type': 'file', 'file_path': self.photo}
+        results = asyncio.run(web_auth.async_post_to_channels(self.session, channels, item))
+        return results, [file for _, file in client.sent]
+
+    def test_rejected_upload_falls_back_to_file(self):
+        results, sent = self.post([FilePartMissingError(request=None, capture=0), SimpleNamespace(id=1, media='m')], ['1'])
+        self.assertTrue(results['1']['ok'])
+        self.assertEqual(sent, ['handle', self.photo])
+
+    def test_other_error_fails_without_upload(self):
+        results, sent = self.post([ChatWriteForbiddenError(request=None), SimpleNamespace(id=2, media='m')], ['1', '2'])
+        self.assertFalse(results['1']['ok'])
+        self.assertTrue(results['2']['ok'])
+        self.assertEqual(sent, ['handle', 'handle'])
+
+    def test_rejected_reused_media_falls_back(self):
+        results, sent = self.post([
+            SimpleNamespace(id=1, media='m'),
+            FilePartMissingError(request=None, capture=0),
+            SimpleNamespace(id=2, media='m'),
+        ], ['1', '2'])
+        self.assertTrue(results['2']['ok'])
+        self.assertEqual(sent, ['handle', 'm', self.photo])
+
+
+if __name__ == '__main__':
+    unittest.main()
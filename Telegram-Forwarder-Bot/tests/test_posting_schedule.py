@@ -0,0 +1,82 @@
+import os
+import unittest
+from unittest import mock
+from datetime import datetime, time
+
+from source.model.AutoPostConfig import AutoPostConfig
+from source.model.PostingSchedule import CronExpression, PostingSchedule
+
+# 2026-10-19 is a Monday
+MONDAY = datetime(2026, 10, 19)
+
+
+class CronExpressionTest(unittest.TestCase):
+    def test_seven_is_sunday(self):
+        self.assertEqual(CronExpression("0 9 * * 7").weekdays, {0})
+        self.assertEqual(CronExpression("0 9 * * 5-7").weekdays, {0, 5, 6})
+
+    def test_invalid_fields(self):
+        for expression in ("0 9 * *", "60 9 * * *", "0 9 * * 8", "0 9 5-1 * *"):
+            with self.assertRaises(ValueError, msg=expression):
+                CronExpression(expression)
+
+    def test_day_or_weekday(self):
+        cron = CronExpression("0 9 1 * 1")
+        self.assertTrue(cron.matches_day(datetime(2026, 11, 1)))   # 1st, a Sunday
+        self.assertTrue(cron.matches_day(datetime(2026, 10, 26)))  # a Monday
+        self.assertFalse(cron.matches_day(datetime(2026, 10, 27)))
+
+
+class PostingScheduleTest(unittest.TestCase):
+    def test_slots(self):
+        schedule = PostingSchedule(slots=["18:30", time(9, 0)])
+        self.assertEqual(schedule.next_slot(MONDAY.replace(hour=10)), MONDAY.replace(hour=18, minute=30))
+        self.assertEqual(schedule.next_slot(MONDAY.replace(hour=19)), datetime(2026, 10, 20, 9, 0))
+
+    def test_inclusive(self):
+        schedule = PostingSchedule(slots=["09:00"])
+        at = MONDAY.replace(hour=9)
+        self.assertEqual(schedule.next_slot(at, inclusive=True), at)
+        self.assertEqual(schedule.next_slot(at), datetime(2026, 10, 20, 9, 0))
+
+    def test_weekdays(self):
+        schedule = PostingSchedule(slots=["09:00"], weekdays=[5, 6])
+        self.assertEqual(schedule.next_slot(MONDAY), datetime(2026, 10, 24, 9, 0))
+        self.assertEqual(str(schedule), "09:00 on Sat,Sun")
+
+    def test_weekdays_out_of_range(self):
+        with self.assertRaises(ValueError):
+            PostingSchedule(weekdays=[7])
+
+    def test_cron_sunday_alias(self):
+        schedule = PostingSchedule(cron="30 8 * * 7")
+        self.assertEqual(schedule.next_slot(MONDAY), datetime(2026, 10, 25, 8, 30))
+
+    def test_beyond_horizon(self):
+        schedule = PostingSchedule(cron="0 12 1 3 *")
+        self.assertEqual(schedule.next_slot(MONDAY), datetime(2027, 3, 1, 12, 0))
+
+    def test_earlier_moment_resets_timeline(self):
+        schedule = PostingSchedule(slots=["09:00"])
+        schedule.next_slot(datetime(2027, 1, 1))
+        self.assertEqual(schedule.next_slot(MONDAY), MONDAY.replace(hour=9))
+
+
+class CronInputTest(unittest.TestCase):
+    def test_valid_cron(self):
+        self.assertTrue(AutoPostConfig._valid_cron(""))
+        self.assertTrue(AutoPostConfig._valid_cron("30 9 * * 1-5"))
+
+    def test_rejects_bad_or_unreachable_cron(self):
+        for expression in ("0 9 * *", "61 9 * * *", "0 0 31 2 *"):
+            self.assertFalse(AutoPostConfig._valid_cron(expression), expression)
+
+    def test_env_cron_is_validated(self):
+        env = {"TG_BOT_TOKEN": "1:token", "TG_OWNER_USERNAME": "owner", "POSTING_CRON": "0 0 31 2 *"}
+        with mock.patch.dict(os.environ, env):
+            with self.assertRaises(ValueError):
+                AutoPostConfig._get_from_env()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import threading
+import unittest
+from unittest import mock
+
+os.environ.setdefault('STORAGE_BACKEND', 'json')
+
+import web_auth
+
+
+class RepositoryTest(unittest.TestCase):
+    def setUp(self):
+        self.stored = {'g1': {'id': 'g1', 'name': 'One', 'content_count': 0, 'total_posts': 0}}
+        patches = [
+            mock.patch.object(web_auth, '_read_config', lambda: {'enabled': True}),
+            mock.patch.object(web_auth, '_read_groups', lambda: [dict(g) for g in self.stored.values()]),
+            mock.patch.object(web_auth, '_update_stored_group', self.store_update),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.store_started = threading.Event()
+        self.store_release = threading.Event()
+        self.store_release.set()
+        self.repo = web_auth.Repository(ttl=300)
+
+    def store_update(self, group_id, ops, group):
+        self.store_started.set()
+        self.store_release.wait(5)
+        self.stored[group_id] = dict(group)
+
+    def test_update_group(self):
+        updated = self.repo.update_group('g1', {'$inc': {'total_posts': 2}, '$set': {'name': 'Uno'}})
+        self.assertEqual(updated['total_posts'], 2)
+        self.assertEqual(self.repo.get_group('g1')['name'], 'Uno')
+        self.assertEqual(self.stored['g1']['total_posts'], 2)
+        self.assertIsNone(self.repo.update_group('missing', {'$set': {'name': 'x'}}))
+
+    def test_reload_does_not_wait_for_inflight_update(self):
+        self.repo.get_groups()
+        self.store_release.clear()
+        writer = threading.Thread(target=self.repo.update_group, args=('g1', {'$inc': {'total_posts': 1}}))
+        writer.start()
+        self.assertTrue(self.store_started.wait(5))
+        
+        # Expire the cache while the write has not reached storage yet
+        self.repo.invalidate()
+        reader = threading.Thread(target=lambda: (self.repo.get_groups(), self.repo.get_config()))
+        reader.start()
+        reader.join(1)
+        self.assertFalse(reader.is_alive(), "readers should not wait for a storage write")
+        
+        self.store_release.set()
+        writer.join(5)
+        self.assertEqual(self.repo.get_group('g1')['total_posts'], 1)
+
+    def test_reload_racing_a_write_reads_again(self):
+        self.repo.get_groups()
+        self.repo.invalidate()
+        reads = []
+
+        def read_groups():
+            groups = [dict(g) for g in self.stored.values()]
+            if not reads:
+                # A write is stored and installed after this read
+                newer = dict(self.stored['g1'], total_posts=5)
+                self.stored['g1'] = newer
+                self.repo._install('g1', newer)
+            reads.append(groups)
+            return groups
+
+        with mock.patch.object(web_auth, '_read_groups', read_groups):
+            self.assertEqual(self.repo.get_group('g1')['total_posts'], 5)
+        self.assertEqual(len(reads), 2)
+
+    def test_invalidate(self):
+        self.repo.get_groups()
+        self.stored['g2'] = {'id': 'g2', 'name': 'Two', 'content_count': 0}
+        self.assertEqual(len(self.repo.get_groups()), 1)
+        self.repo.invalidate()
+        self.assertEqual([g['id'] for g in self.repo.get_groups()], ['g1', 'g2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
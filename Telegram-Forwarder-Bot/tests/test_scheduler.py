@@ -0,0 +1,140 @@
+import os
+import time
+import unittest
+from concurrent.futures import Future
+from datetime import datetime
+from unittest import mock
+
+os.environ.setdefault('STORAGE_BACKEND', 'json')
+
+import web_auth
+
+
+def make_group(gid, **fields):
+    group = {'id': gid, 'name': gid, 'enabled': True, 'content_count': 2, 'channels': ['-1001'],
+             'interval_minutes': 10, 'total_posts': 0, 'current_content_index': 0,
+             'last_post_at': None, 'next_due_at': None}
+    group.update(fields)
+    return group
+
+
+class SchedulerCase(unittest.TestCase):
+    """Scheduler state reset around each test, groups kept in self.stored"""
+
+    def setUp(self):
+        self.stored = {}
+        repo = web_auth.Repository(ttl=0)
+        patches = [
+            mock.patch.object(web_auth, 'repo', repo),
+            mock.patch.object(web_auth, '_read_config', lambda: {}),
+            mock.patch.object(web_auth, '_read_groups', lambda: list(self.stored.values())),
+            mock.patch.object(web_auth, '_update_stored_group',
+                              lambda gid, ops, group: self.stored.__setitem__(gid, group)),
+            mock.patch.object(web_auth, 'SCHEDULER_JITTER_SECONDS', 0),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for state in (web_auth.schedule_heap, web_auth.schedule_versions, web_auth.posting_groups):
+            state.clear()
+            self.addCleanup(state.clear)
+
+    def add(self, group):
+        self.stored[group['id']] = group
+        web_auth.repo.invalidate()
+
+    def live_entries(self):
+        return sorted((due, gid) for due, gid, version in web_auth.schedule_heap
+                      if web_auth.schedule_versions.get(gid) == version)
+
+
+class SchedulerTest(SchedulerCase):
+    def test_reschedule_replaces_entry(self):
+        self.add(make_group('a'))
+        web_auth.reschedule_group('a', due=time.time() + 100)
+        web_auth.reschedule_group('a', due=time.time() - 1)
+        self.assertEqual(len(web_auth.schedule_heap), 2)
+        self.assertEqual([gid for _, gid in self.live_entries()], ['a'])
+        self.assertEqual(web_auth.wait_for_due_group(0), 'a')
+        # The older entry is stale and skipped
+        self.assertIsNone(web_auth.wait_for_due_group(0))
+        self.assertEqual(web_auth.schedule_heap, [])
+
+    def test_unschedulable_and_in_flight_groups(self):
+        self.add(make_group('a', enabled=False))
+        self.add(make_group('b'))
+        web_auth.reschedule_group('a')
+        self.assertNotIn('a', web_auth.schedule_versions)
+        web_auth.posting_groups.add('b')
+        web_auth.reschedule_group('b')
+        self.assertNotIn('b', web_auth.schedule_versions)
+
+    def test_not_due_yet(self):
+        self.add(make_group('a'))
+        web_auth.reschedule_group('a', due=time.time() + 60)
+        self.assertIsNone(web_auth.wait_for_due_group(0.01))
+        self.assertIn('a', web_auth.schedule_versions)
+
+    def test_heap_is_compacted(self):
+        self.add(make_group('a'))
+        for i in range(200):
+            web_auth.reschedule_group('a', due=time.time() + i)
+        self.assertLessEqual(len(web_auth.schedule_heap), 2 * len(web_auth.schedule_versions) + 64)
+        self.assertEqual(len(self.live_entries()), 1)
+
+    def finish(self, gid, results):
+        future = Future()
+        if isinstance(results, Exception):
+            future.set_exception(results)
+        else:
+            future.set_result(results)
+        web_auth.posting_groups.add(gid)
+        web_auth.finish_post(gid, web_auth.repo.get_group(gid), web_auth.repo.get_group(gid)['current_content_index'], future)
+
+    def test_finish_post_success(self):
+        self.add(make_group('a', current_content_index=1))
+        self.finish('a', {'-1001': {'ok': True}, '-1002': {'ok': False, 'error': 'x'}})
+        group = self.stored['a']
+        self.assertEqual(group['total_posts'], 1)
+        self.assertEqual(group['current_content_index'], 0)
+        next_due = datetime.fromisoformat(group['next_due_at']).timestamp()
+        self.assertAlmostEqual(next_due, time.time() + 600, delta=2)
+        self.assertNotIn('a', web_auth.posting_groups)
+        self.assertEqual(self.live_entries(), [(next_due, 'a')])
+
+    def test_finish_post_failure_retries(self):
+        self.add(make_group('a'))
+        self.finish('a', RuntimeError('timeout'))
+        self.assertEqual(self.stored['a']['total_posts'], 0)
+        (due, gid), = self.live_entries()
+        self.assertAlmostEqual(due, time.time() + web_auth.RETRY_SECONDS, delta=2)
+
+    def test_group_stays_in_flight_until_update_is_saved(self):
+        self.add(make_group('a'))
+        seen = []
+
+        def store_update(gid, ops, group):
+            # A concurrent edit tries to reschedule while the post is being saved
+            seen.append(gid in web_auth.posting_groups)
+            web_auth.reschedule_group(gid)
+            seen.append(gid in web_auth.schedule_versions)
+            self.stored[gid] = group
+
+        with mock.patch.object(web_auth, '_update_stored_group', store_update):
+            self.finish('a', {'-1001': {'ok': True}})
+        self.assertEqual(seen, [True, False])
+        next_due = datetime.fromisoformat(self.stored['a']['next_due_at']).timestamp()
+        self.assertEqual(self.live_entries(), [(next_due, 'a')])
+        self.assertNotIn('a', web_auth.posting_groups)
+
+    def test_failed_save_releases_group_for_retry(self):
+        self.add(make_group('a'))
+        with mock.patch.object(web_auth, '_update_stored_group', mock.Mock(side_effect=RuntimeError('db'))):
+            self.finish('a', {'-1001': {'ok': True}})
+        self.assertNotIn('a', web_auth.posting_groups)
+        (due, gid), = self.live_entries()
+        self.assertAlmostEqual(due, time.time() + web_auth.RETRY_SECONDS, delta=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+os.environ.setdefault('STORAGE_BACKEND', 'json')
+
+import web_auth
+
+
+class SessionAuthorizedTest(unittest.TestCase):
+    def setUp(self):
+        for state in (web_auth.auth_data, web_auth.session_recheck_at):
+            self.addCleanup(state.clear)
+
+    def test_login_in_progress_is_not_opened(self):
+        web_auth.auth_data['session_file'] = 'sessions/session_1'
+        with mock.patch.object(web_auth, 'run_async') as run_async:
+            self.assertFalse(web_auth.session_authorized('sessions/session_1'))
+        run_async.assert_not_called()
+        # Not marked for a delayed re-check, it is usable as soon as the login ends
+        self.assertNotIn('sessions/session_1', web_auth.session_recheck_at)
+
+    def test_unauthorized_is_rechecked_later(self):
+        answers = iter([False, True])
+        
+        def run_async(coro):
+            coro.close()
+            return next(answers)
+        
+        with mock.patch.object(web_auth, 'run_async', side_effect=run_async) as run_async:
+            self.assertFalse(web_auth.session_authorized('sessions/session_2'))
+            self.assertFalse(web_auth.session_authorized('sessions/session_2'))
+            self.assertEqual(run_async.call_count, 1)
+            web_auth.session_recheck_at['sessions/session_2'] = time.time() - 1
+            self.assertTrue(web_auth.session_authorized('sessions/session_2'))
+
+
+class SessionRingTest(unittest.TestCase):
+    def test_stable_and_failover(self):
+        ring = web_auth.SessionRing(['a', 'b', 'c'])
+        picks = {ch: ring.pick(ch) for ch in range(300)}
+        self.assertEqual(set(picks.values()), {'a', 'b', 'c'})
+        
+        # Removing a session only moves its own channels
+        smaller = web_auth.SessionRing(['a', 'b'])
+        for ch, session in picks.items():
+            if session != 'c':
+                self.assertEqual(smaller.pick(ch), session)
+        
+        ch = next(ch for ch, session in picks.items() if session == 'a')
+        self.assertNotEqual(ring.pick(ch, exclude={'a'}), 'a')
+        self.assertIsNone(ring.pick(ch, exclude={'a', 'b', 'c'}))
+        self.assertIsNone(web_auth.SessionRing().pick(ch))
+
+    def test_has_sessions_ignores_order(self):
+        # Session files come in directory order, the ring keeps them sorted
+        ring = web_auth.SessionRing(['c', 'a', 'b'])
+        self.assertTrue(ring.has_sessions(['b', 'c', 'a']))
+        self.assertFalse(ring.has_sessions(['a', 'b']))
+        self.assertFalse(ring.has_sessions(['a', 'b', 'c', 'd']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from source.utils.Storage import JsonStore, SqliteStore, open_store
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StoreContract:
+    """Behaviour every local store shares, run against each backend below"""
+
+    def make_store(self, path):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = self.make_store(self.tmp.name)
+
+    def test_empty(self):
+        self.assertIsNone(self.store.read_config())
+        self.assertEqual(self.store.read_groups(), [])
+        self.assertEqual(self.store.read_content('g1'), [])
+
+    def test_groups_in_order(self):
+        self.store.store_group({'id': 'g1', 'name': 'One'}, ['g1'])
+        self.store.store_group({'id': 'g2', 'name': 'Two'}, ['g1', 'g2'])
+        self.store.update_group('g1', {'$set': {'name': 'Uno'}}, {'id': 'g1', 'name': 'Uno'})
+        self.assertEqual([g['name'] for g in self.store.read_groups()], ['Uno', 'Two'])
+        self.store.delete_group('g1', ['g2'])
+        self.assertEqual([g['id'] for g in self.store.read_groups()], ['g2'])
+
+    def test_content_positions(self):
+        for position, item_id in enumerate(['a', 'b', 'c']):
+            self.store.append_content('g1', {'id': item_id}, position)
+        self.assertTrue(self.store.remove_content('g1', 'b'))
+        self.assertFalse(self.store.remove_content('g1', 'b'))
+        self.assertEqual([c['id'] for c in self.store.read_content('g1')], ['a', 'c'])
+        self.assertEqual(self.store.read_content('g1', 1), {'id': 'c'})
+        self.assertIsNone(self.store.read_content('g1', 2))
+
+    def test_dump_and_replace(self):
+        data = {'config': {'enabled': True}, 'groups': [{'id': 'g1'}, {'id': 'g2'}],
+                'content': {'g1': [{'id': 'a'}], 'g2': []}}
+        self.store.replace_all(data)
+        self.assertEqual(self.store.dump(), data)
+
+
+class JsonStoreTest(StoreContract, unittest.TestCase):
+    def make_store(self, path):
+        return JsonStore(path)
+
+    def test_corrupt_index_raises(self):
+        self.store.store_group({'id': 'g1'}, ['g1'])
+        with open(self.store.index_path, 'w') as f:
+            f.write('[')
+        with self.assertRaises(ValueError):
+            self.store.read_groups()
+
+    def test_corrupt_config_raises(self):
+        with open(self.store.config_path, 'w') as f:
+            f.write('{')
+        with self.assertRaises(ValueError):
+            self.store.read_config()
+
+    def test_legacy_groups_file(self):
+        with open(self.store.legacy_groups_path, 'w') as f:
+            json.dump([{'id': 'old', 'name': 'Old'}], f)
+        self.assertEqual(self.store.read_groups(), [{'id': 'old', 'name': 'Old'}])
+        self.assertTrue(os.path.exists(self.store.legacy_groups_path + '.migrated'))
+
+
+class SqliteStoreTest(StoreContract, unittest.TestCase):
+    def make_store(self, path):
+        return SqliteStore(os.path.join(path, 'test.db'))
+
+
+class OpenStoreTest(unittest.TestCase):
+    def test_backends(self):
+        with tempfile.TemporaryDirectory() as path:
+            self.assertIsInstance(open_store('json', path), JsonStore)
+            self.assertIsInstance(open_store('sqlite', path), SqliteStore)
+            with self.assertRaises(ValueError):
+                open_store('mongo', path, None)
+            with self.assertRaises(ValueError):
+                open_store('redis', path)
+
+    def test_import_has_no_side_effects(self):
+        code = 'import sys, source.utils.Storage; print("web_auth" in sys.modules, "flask" in sys.modules)'
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.split(), ['False', 'False'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import unittest
+from unittest import mock
+
+from pymongo.errors import AutoReconnect, OperationFailure, WriteError
+
+os.environ.setdefault('STORAGE_BACKEND', 'json')
+
+import web_auth
+
+
+class StorageReadTest(unittest.TestCase):
+    def setUp(self):
+        self.local = mock.Mock()
+        self.local.name = 'json'
+        self.local.read_groups.return_value = [{'id': 'local'}]
+        self.db = mock.MagicMock()
+        self.failed = mock.Mock(return_value=False)
+        patches = [
+            mock.patch.object(web_auth, 'local_store', self.local),
+            mock.patch.object(web_auth, 'get_mongo_db', lambda: self.db),
+            mock.patch.object(web_auth.mongo, 'failed', self.failed),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_reads_mongo(self):
+        self.db.content_groups.find.return_value = [{'id': 'm', 'data': {'id': 'm'}}]
+        self.assertEqual(web_auth._read_groups(), [{'id': 'm'}])
+        self.local.read_groups.assert_not_called()
+
+    def test_mongo_error_falls_back_to_local_store(self):
+        self.db.content_groups.find.side_effect = OperationFailure('unauthorized')
+        self.assertEqual(web_auth._read_groups(), [{'id': 'local'}])
+        self.failed.assert_called_once()
+
+    def test_connection_error_falls_back_to_local_store(self):
+        self.db.content_groups.find.side_effect = AutoReconnect('gone')
+        self.failed.return_value = True
+        self.assertEqual(web_auth._read_groups(), [{'id': 'local'}])
+
+    def test_local_store_error_propagates(self):
+        self.db.content_groups.find.side_effect = OperationFailure('unauthorized')
+        self.local.read_groups.side_effect = ValueError('corrupt index')
+        with self.assertRaises(ValueError):
+            web_auth._read_groups()
+
+    def test_without_mongo(self):
+        with mock.patch.object(web_auth, 'get_mongo_db', lambda: None):
+            self.assertEqual(web_auth._read_groups(), [{'id': 'local'}])
+        self.db.content_groups.find.assert_not_called()
+
+
+class StorageWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.local = mock.Mock()
+        self.local.name = 'json'
+        self.db = mock.MagicMock()
+        self.failed = mock.Mock(return_value=False)
+        self.queue = mock.Mock()
+        patches = [
+            mock.patch.object(web_auth, 'local_store', self.local),
+            mock.patch.object(web_auth, 'get_mongo_db', lambda: self.db),
+            mock.patch.object(web_auth.mongo, 'failed', self.failed),
+            mock.patch.object(web_auth.mongo, 'queue', self.queue),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_writes_both_stores(self):
+        web_auth._write_config({'enabled': True})
+        self.db.config.update_one.assert_called_once()
+        self.local.write_config.assert_called_once_with({'enabled': True})
+
+    def test_rejected_write_leaves_local_store_alone(self):
+        self.db.config.update_one.side_effect = WriteError('document failed validation')
+        with self.assertRaises(WriteError):
+            web_auth._write_config({'enabled': True})
+        self.local.write_config.assert_not_called()
+        self.queue.assert_not_called()
+
+    def test_connection_error_journals_and_writes_locally(self):
+        self.db.config.update_one.side_effect = AutoReconnect('gone')
+        self.failed.return_value = True
+        web_auth._write_config({'enabled': True})
+        self.queue.assert_called_once_with('write_config', ({'enabled': True},))
+        self.local.write_config.assert_called_once_with({'enabled': True})
+
+
+if __name__ == '__main__':
+    unittest.main()